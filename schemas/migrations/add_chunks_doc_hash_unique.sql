@@ -0,0 +1,32 @@
+-- schemas/migrations/add_chunks_doc_hash_unique.sql
+-- Migration: add UNIQUE(doc_id, hash) on chunks (v2.1 and v2.2)
+--
+-- Chunk importers insert with ON CONFLICT(doc_id, hash) DO NOTHING, which
+-- requires this index. Existing duplicates are removed first, keeping the
+-- oldest row (lowest id) of each (doc_id, hash) pair.
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/add_chunks_doc_hash_unique.sql
+
+.print "=== Migration: chunks UNIQUE(doc_id, hash) ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+.print "Removing duplicate chunks..."
+DELETE FROM chunks
+WHERE hash IS NOT NULL
+  AND id NOT IN (
+      SELECT MIN(id) FROM chunks
+      WHERE hash IS NOT NULL
+      GROUP BY doc_id, hash
+  );
+SELECT '  ✓ Removed ' || changes() || ' duplicate chunks' AS result;
+
+.print "Creating unique index..."
+CREATE UNIQUE INDEX IF NOT EXISTS idx_chunks_doc_hash ON chunks(doc_id, hash);
+
+COMMIT;
+
+.print ""
+.print "✓ Migration complete"
@@ -0,0 +1,134 @@
+-- schemas/migrations/add_chunks_fts_doc_type.sql
+-- Migration: store doc_type and the UNINDEXED columns in chunks_fts (v2.2)
+--
+-- Recreates chunks_fts with a doc_type UNINDEXED column and
+-- contentless_unindexed=1, so module/topic_id/doc_type read back from the
+-- index and query_rag fts_search filters on them before joining chunks
+-- and docs. A contentless index can't be altered or rebuilt in place: the
+-- table is dropped, recreated and refilled from chunks, and its triggers
+-- are recreated. Safe to re-run: a failed statement aborts the whole
+-- migration (.bail on), and a re-run rebuilds the index again. Requires
+-- SQLite 3.47+ (the v2.2 schema already requires 3.51).
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/add_chunks_fts_doc_type.sql
+
+.bail on
+
+.print "=== Migration: chunks_fts doc_type ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+DROP TRIGGER IF EXISTS chunks_fts_ai;
+DROP TRIGGER IF EXISTS chunks_fts_au;
+DROP TRIGGER IF EXISTS chunks_fts_ad;
+DROP TRIGGER IF EXISTS docs_fts_au;
+DROP TABLE IF EXISTS chunks_fts;
+-- DROP TABLE on a contentless_unindexed table leaves its _content shadow
+-- table behind (re-runs). The sqlite3 shell's defensive mode protects
+-- shadow tables, so lift it for this one statement.
+.dbconfig defensive off
+DROP TABLE IF EXISTS chunks_fts_content;
+.dbconfig defensive on
+
+CREATE VIRTUAL TABLE chunks_fts USING fts5(
+    text,
+    heading,
+    doc_id UNINDEXED,
+    topic_id UNINDEXED,
+    module UNINDEXED,
+    doc_type UNINDEXED,
+    content='',  -- CONTENTLESS - we manage data manually
+    contentless_unindexed=1,  -- but store UNINDEXED columns, so search
+                              -- filters apply before joining chunks/docs
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+
+-- Column weights for ORDER BY rank: heading hits count double text hits.
+-- Stored in the table's config (rank is not a CREATE option), so every
+-- query keeps ordering by the rank column with no bm25() call.
+INSERT INTO chunks_fts(chunks_fts, rank) VALUES ('rank', 'bm25(5.0, 10.0)');
+
+-- Trigger: INSERT chunk → INSERT into FTS (with JOIN to docs)
+CREATE TRIGGER chunks_fts_ai AFTER INSERT ON chunks
+BEGIN
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
+  SELECT
+    NEW.id,
+    NEW.text,
+    NEW.heading,
+    NEW.doc_id,
+    d.topic_id,
+    d.module,
+    d.doc_type
+  FROM docs d
+  WHERE d.id = NEW.doc_id;
+END;
+
+-- Trigger: UPDATE chunk → UPDATE FTS (DELETE + INSERT)
+CREATE TRIGGER chunks_fts_au AFTER UPDATE ON chunks
+BEGIN
+  -- Delete old entry
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
+  VALUES('delete', OLD.id, OLD.text, OLD.heading, OLD.doc_id,
+         (SELECT topic_id FROM docs WHERE id = OLD.doc_id),
+         (SELECT module FROM docs WHERE id = OLD.doc_id),
+         (SELECT doc_type FROM docs WHERE id = OLD.doc_id));
+
+  -- Insert new entry
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
+  SELECT
+    NEW.id,
+    NEW.text,
+    NEW.heading,
+    NEW.doc_id,
+    d.topic_id,
+    d.module,
+    d.doc_type
+  FROM docs d
+  WHERE d.id = NEW.doc_id;
+END;
+
+-- Trigger: DELETE chunk → DELETE from FTS
+CREATE TRIGGER chunks_fts_ad AFTER DELETE ON chunks
+BEGIN
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
+  VALUES('delete', OLD.id, OLD.text, OLD.heading, OLD.doc_id,
+         (SELECT topic_id FROM docs WHERE id = OLD.doc_id),
+         (SELECT module FROM docs WHERE id = OLD.doc_id),
+         (SELECT doc_type FROM docs WHERE id = OLD.doc_id));
+END;
+
+-- Trigger: UPDATE docs.module/topic_id/doc_type → UPDATE FTS for all chunks of that doc
+CREATE TRIGGER docs_fts_au AFTER UPDATE OF module, topic_id, doc_type ON docs
+BEGIN
+  -- Delete old FTS entries for all chunks of this doc
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
+  SELECT 'delete', c.id, c.text, c.heading, c.doc_id, OLD.topic_id, OLD.module, OLD.doc_type
+  FROM chunks c
+  WHERE c.doc_id = NEW.id;
+
+  -- Insert new FTS entries with updated module/topic_id/doc_type
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
+  SELECT
+    c.id,
+    c.text,
+    c.heading,
+    c.doc_id,
+    NEW.topic_id,
+    NEW.module,
+    NEW.doc_type
+  FROM chunks c
+  WHERE c.doc_id = NEW.id;
+END;
+
+.print "Reindexing chunks..."
+INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
+SELECT c.id, c.text, c.heading, c.doc_id, d.topic_id, d.module, d.doc_type
+FROM chunks c
+JOIN docs d ON d.id = c.doc_id;
+
+COMMIT;
+
+.print "✓ Migration complete"
@@ -0,0 +1,25 @@
+-- schemas/migrations/add_docs_author_created_index.sql
+-- Migration: ordered author index for paged doc searches (v2.2)
+--
+-- search_docs_by_metadata('author', ...) orders by created_at DESC, id DESC
+-- and pages with LIMIT/after_id. With the sort columns in the index the
+-- planner walks it in order instead of sorting every match. The index
+-- covers the old single-column idx_docs_meta_author, which is dropped.
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/add_docs_author_created_index.sql
+
+.print "=== Migration: docs author/created_at index ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+CREATE INDEX IF NOT EXISTS idx_docs_author_created
+ON docs(jsonb_extract(metadata_jsonb, '$.author'), created_at DESC, id DESC)
+WHERE metadata_jsonb IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_docs_meta_author;
+
+COMMIT;
+
+.print "✓ Migration complete"
@@ -0,0 +1,41 @@
+-- schemas/migrations/add_jsonb_hot_key_indexes.sql
+-- Migration: expression indexes for hot JSONB keys (v2.2)
+--
+-- jsonb_helpers.JSONBQueryHelper inlines the paths of the keys in HOT_KEYS
+-- as literals, so lookups on them can use these indexes instead of
+-- scanning every row's JSONB.
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/add_jsonb_hot_key_indexes.sql
+
+.print "=== Migration: JSONB hot key indexes ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+CREATE INDEX IF NOT EXISTS idx_sessions_tel_total_tokens
+ON sessions(jsonb_extract(telemetry_jsonb, '$.total_tokens'))
+WHERE telemetry_jsonb IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_sessions_tel_user_satisfaction
+ON sessions(jsonb_extract(telemetry_jsonb, '$.user_satisfaction'))
+WHERE telemetry_jsonb IS NOT NULL;
+
+-- author also carries the search order (same index as the schema and
+-- add_docs_author_created_index.sql, so the two apply in either order)
+CREATE INDEX IF NOT EXISTS idx_docs_author_created
+ON docs(jsonb_extract(metadata_jsonb, '$.author'), created_at DESC, id DESC)
+WHERE metadata_jsonb IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_docs_meta_priority
+ON docs(jsonb_extract(metadata_jsonb, '$.priority'))
+WHERE metadata_jsonb IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_meta_source_file
+ON chunks(jsonb_extract(metadata_jsonb, '$.source_file'))
+WHERE metadata_jsonb IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_chunks_meta_language
+ON chunks(jsonb_extract(metadata_jsonb, '$.language'))
+WHERE metadata_jsonb IS NOT NULL;
+
+COMMIT;
+
+.print "✓ Migration complete"
@@ -0,0 +1,125 @@
+-- schemas/migrations/add_stats_cache.sql
+-- Migration: trigger-maintained stats tables (v2.1 and v2.2)
+--
+-- query_rag stats reads its counts from stats_cache/stats_group instead of
+-- scanning docs, chunks, topics and sessions. The triggers keep them
+-- current on every write; this migration creates them and fills them
+-- from the existing data once. Safe to re-run: it rebuilds the counts.
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/add_stats_cache.sql
+
+.print "=== Migration: stats cache ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS stats_cache (
+    key     TEXT PRIMARY KEY,
+    value   INTEGER NOT NULL DEFAULT 0
+);
+
+-- Row counts per value of a grouped column
+-- (bucket: 'doc_type', 'module', 'topic_status')
+CREATE TABLE IF NOT EXISTS stats_group (
+    bucket  TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (bucket, key)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS docs_stats_ai AFTER INSERT ON docs
+BEGIN
+  INSERT INTO stats_group (bucket, key, count) VALUES ('doc_type', NEW.doc_type, 1), ('module', NEW.module, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS docs_stats_ad AFTER DELETE ON docs
+BEGIN
+  UPDATE stats_group SET count = count - 1
+  WHERE (bucket = 'doc_type' AND key = OLD.doc_type) OR (bucket = 'module' AND key = OLD.module);
+  DELETE FROM stats_group WHERE bucket IN ('doc_type', 'module') AND count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS docs_stats_au AFTER UPDATE OF doc_type, module ON docs
+BEGIN
+  UPDATE stats_group SET count = count - 1
+  WHERE (bucket = 'doc_type' AND key = OLD.doc_type) OR (bucket = 'module' AND key = OLD.module);
+  INSERT INTO stats_group (bucket, key, count) VALUES ('doc_type', NEW.doc_type, 1), ('module', NEW.module, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+  DELETE FROM stats_group WHERE bucket IN ('doc_type', 'module') AND count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_stats_ai AFTER INSERT ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value + 1 WHERE key = 'total_chunks';
+  UPDATE stats_cache SET value = value + COALESCE(NEW.token_est, 0) WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_stats_ad AFTER DELETE ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value - 1 WHERE key = 'total_chunks';
+  UPDATE stats_cache SET value = value - COALESCE(OLD.token_est, 0) WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_stats_au AFTER UPDATE OF token_est ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value + COALESCE(NEW.token_est, 0) - COALESCE(OLD.token_est, 0)
+  WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER IF NOT EXISTS topics_stats_ai AFTER INSERT ON topics
+BEGIN
+  INSERT INTO stats_group (bucket, key, count) VALUES ('topic_status', NEW.status, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS topics_stats_ad AFTER DELETE ON topics
+BEGIN
+  UPDATE stats_group SET count = count - 1 WHERE bucket = 'topic_status' AND key = OLD.status;
+  DELETE FROM stats_group WHERE bucket = 'topic_status' AND count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS topics_stats_au AFTER UPDATE OF status ON topics
+BEGIN
+  UPDATE stats_group SET count = count - 1 WHERE bucket = 'topic_status' AND key = OLD.status;
+  INSERT INTO stats_group (bucket, key, count) VALUES ('topic_status', NEW.status, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+  DELETE FROM stats_group WHERE bucket = 'topic_status' AND count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_stats_ai AFTER INSERT ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value + 1 WHERE key = 'total_sessions';
+  UPDATE stats_cache SET value = value + NEW.imported_to_docs WHERE key = 'imported_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_stats_ad AFTER DELETE ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value - 1 WHERE key = 'total_sessions';
+  UPDATE stats_cache SET value = value - OLD.imported_to_docs WHERE key = 'imported_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_stats_au AFTER UPDATE OF imported_to_docs ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value + NEW.imported_to_docs - OLD.imported_to_docs
+  WHERE key = 'imported_sessions';
+END;
+
+.print "Rebuilding counts..."
+DELETE FROM stats_cache;
+INSERT INTO stats_cache (key, value)
+SELECT 'total_chunks', COUNT(*) FROM chunks
+UNION ALL SELECT 'total_tokens', COALESCE(SUM(token_est), 0) FROM chunks
+UNION ALL SELECT 'total_sessions', COUNT(*) FROM sessions
+UNION ALL SELECT 'imported_sessions', COUNT(*) FROM sessions WHERE imported_to_docs = 1;
+
+DELETE FROM stats_group;
+INSERT INTO stats_group (bucket, key, count)
+SELECT 'doc_type', doc_type, COUNT(*) FROM docs GROUP BY doc_type
+UNION ALL SELECT 'module', module, COUNT(*) FROM docs GROUP BY module
+UNION ALL SELECT 'topic_status', status, COUNT(*) FROM topics GROUP BY status;
+
+COMMIT;
+
+.print "✓ Migration complete"
@@ -0,0 +1,22 @@
+-- schemas/migrations/set_chunks_fts_rank_weights.sql
+-- Migration: weight heading over text in chunks_fts ranking (v2.1 and v2.2)
+--
+-- Sets the FTS5 rank function to bm25(5.0, 10.0), so heading matches count
+-- double text matches wherever results are ordered by rank (query_rag
+-- fts_search). The setting is stored in chunks_fts_config and applies to
+-- the existing index at query time: no rebuild is needed (and a
+-- contentless table can't be rebuilt).
+--
+-- Usage:
+--   sqlite3 sqlite_knowledge.db < schemas/migrations/set_chunks_fts_rank_weights.sql
+
+.print "=== Migration: chunks_fts rank weights ==="
+.print ""
+
+BEGIN IMMEDIATE;
+
+INSERT INTO chunks_fts(chunks_fts, rank) VALUES ('rank', 'bm25(5.0, 10.0)');
+
+COMMIT;
+
+.print "✓ Migration complete"
@@ -139,6 +139,8 @@ CREATE TABLE chunks (
 CREATE INDEX idx_chunks_doc_ord ON chunks(doc_id, ord);
 CREATE INDEX idx_chunks_kind ON chunks(kind);
 CREATE INDEX idx_chunks_hash ON chunks(hash);
+-- One copy of each chunk per doc; re-imports skip existing content
+CREATE UNIQUE INDEX idx_chunks_doc_hash ON chunks(doc_id, hash);
 
 -- ==============================================================================
 -- FTS5 - CONTENTLESS MODE (proper solution)
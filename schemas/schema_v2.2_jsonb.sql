@@ -90,6 +90,14 @@ CREATE INDEX idx_sessions_started ON sessions(started_at DESC);
 CREATE INDEX idx_sessions_telemetry_jsonb ON sessions(telemetry_jsonb)
 WHERE telemetry_jsonb IS NOT NULL;
 
+-- Expression indexes for hot telemetry keys (jsonb_helpers.HOT_KEYS)
+CREATE INDEX idx_sessions_tel_total_tokens
+ON sessions(jsonb_extract(telemetry_jsonb, '$.total_tokens'))
+WHERE telemetry_jsonb IS NOT NULL;
+CREATE INDEX idx_sessions_tel_user_satisfaction
+ON sessions(jsonb_extract(telemetry_jsonb, '$.user_satisfaction'))
+WHERE telemetry_jsonb IS NOT NULL;
+
 -- Partial index for active sessions (finished_at IS NULL)
 CREATE INDEX idx_sessions_active ON sessions(finished_at)
 WHERE finished_at IS NULL;
@@ -211,6 +219,16 @@ CREATE INDEX idx_docs_slug ON docs(slug);
 CREATE INDEX idx_docs_metadata_jsonb ON docs(metadata_jsonb)
 WHERE metadata_jsonb IS NOT NULL;
 
+-- Expression indexes for hot metadata keys (jsonb_helpers.HOT_KEYS).
+-- author also carries the search order, so paged author lookups walk the
+-- index instead of sorting every match.
+CREATE INDEX idx_docs_author_created
+ON docs(jsonb_extract(metadata_jsonb, '$.author'), created_at DESC, id DESC)
+WHERE metadata_jsonb IS NOT NULL;
+CREATE INDEX idx_docs_meta_priority
+ON docs(jsonb_extract(metadata_jsonb, '$.priority'))
+WHERE metadata_jsonb IS NOT NULL;
+
 CREATE TRIGGER docs_update_timestamp
 AFTER UPDATE ON docs
 BEGIN
@@ -267,11 +285,21 @@ CREATE TABLE chunks (
 CREATE INDEX idx_chunks_doc_ord ON chunks(doc_id, ord);
 CREATE INDEX idx_chunks_kind ON chunks(kind);
 CREATE INDEX idx_chunks_hash ON chunks(hash);
+-- One copy of each chunk per doc; re-imports skip existing content
+CREATE UNIQUE INDEX idx_chunks_doc_hash ON chunks(doc_id, hash);
 
 -- JSONB partial index (only rows with JSONB)
 CREATE INDEX idx_chunks_metadata_jsonb ON chunks(metadata_jsonb)
 WHERE metadata_jsonb IS NOT NULL;
 
+-- Expression indexes for hot metadata keys (jsonb_helpers.HOT_KEYS)
+CREATE INDEX idx_chunks_meta_source_file
+ON chunks(jsonb_extract(metadata_jsonb, '$.source_file'))
+WHERE metadata_jsonb IS NOT NULL;
+CREATE INDEX idx_chunks_meta_language
+ON chunks(jsonb_extract(metadata_jsonb, '$.language'))
+WHERE metadata_jsonb IS NOT NULL;
+
 -- Trigger: Validate JSON before INSERT
 CREATE TRIGGER chunks_metadata_validate BEFORE INSERT ON chunks
 WHEN NEW.metadata IS NOT NULL
@@ -312,21 +340,30 @@ CREATE VIRTUAL TABLE chunks_fts USING fts5(
     doc_id UNINDEXED,
     topic_id UNINDEXED,
     module UNINDEXED,
+    doc_type UNINDEXED,
     content='',  -- CONTENTLESS - we manage data manually
+    contentless_unindexed=1,  -- but store UNINDEXED columns, so search
+                              -- filters apply before joining chunks/docs
     tokenize='porter unicode61 remove_diacritics 2'
 );
 
+-- Column weights for ORDER BY rank: heading hits count double text hits.
+-- Stored in the table's config (rank is not a CREATE option), so every
+-- query keeps ordering by the rank column with no bm25() call.
+INSERT INTO chunks_fts(chunks_fts, rank) VALUES ('rank', 'bm25(5.0, 10.0)');
+
 -- Trigger: INSERT chunk → INSERT into FTS (with JOIN to docs)
 CREATE TRIGGER chunks_fts_ai AFTER INSERT ON chunks
 BEGIN
-  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module)
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
   SELECT
     NEW.id,
     NEW.text,
     NEW.heading,
     NEW.doc_id,
     d.topic_id,
-    d.module
+    d.module,
+    d.doc_type
   FROM docs d
   WHERE d.id = NEW.doc_id;
 END;
@@ -335,20 +372,22 @@ END;
 CREATE TRIGGER chunks_fts_au AFTER UPDATE ON chunks
 BEGIN
   -- Delete old entry
-  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module)
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
   VALUES('delete', OLD.id, OLD.text, OLD.heading, OLD.doc_id,
          (SELECT topic_id FROM docs WHERE id = OLD.doc_id),
-         (SELECT module FROM docs WHERE id = OLD.doc_id));
+         (SELECT module FROM docs WHERE id = OLD.doc_id),
+         (SELECT doc_type FROM docs WHERE id = OLD.doc_id));
 
   -- Insert new entry
-  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module)
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
   SELECT
     NEW.id,
     NEW.text,
     NEW.heading,
     NEW.doc_id,
     d.topic_id,
-    d.module
+    d.module,
+    d.doc_type
   FROM docs d
   WHERE d.id = NEW.doc_id;
 END;
@@ -356,34 +395,138 @@ END;
 -- Trigger: DELETE chunk → DELETE from FTS
 CREATE TRIGGER chunks_fts_ad AFTER DELETE ON chunks
 BEGIN
-  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module)
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
   VALUES('delete', OLD.id, OLD.text, OLD.heading, OLD.doc_id,
          (SELECT topic_id FROM docs WHERE id = OLD.doc_id),
-         (SELECT module FROM docs WHERE id = OLD.doc_id));
+         (SELECT module FROM docs WHERE id = OLD.doc_id),
+         (SELECT doc_type FROM docs WHERE id = OLD.doc_id));
 END;
 
--- Trigger: UPDATE docs.module → UPDATE FTS for all chunks of that doc
-CREATE TRIGGER docs_fts_au AFTER UPDATE OF module, topic_id ON docs
+-- Trigger: UPDATE docs.module/topic_id/doc_type → UPDATE FTS for all chunks of that doc
+CREATE TRIGGER docs_fts_au AFTER UPDATE OF module, topic_id, doc_type ON docs
 BEGIN
   -- Delete old FTS entries for all chunks of this doc
-  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module)
-  SELECT 'delete', c.id, c.text, c.heading, c.doc_id, OLD.topic_id, OLD.module
+  INSERT INTO chunks_fts(chunks_fts, rowid, text, heading, doc_id, topic_id, module, doc_type)
+  SELECT 'delete', c.id, c.text, c.heading, c.doc_id, OLD.topic_id, OLD.module, OLD.doc_type
   FROM chunks c
   WHERE c.doc_id = NEW.id;
 
-  -- Insert new FTS entries with updated module/topic_id
-  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module)
+  -- Insert new FTS entries with updated module/topic_id/doc_type
+  INSERT INTO chunks_fts(rowid, text, heading, doc_id, topic_id, module, doc_type)
   SELECT
     c.id,
     c.text,
     c.heading,
     c.doc_id,
     NEW.topic_id,
-    NEW.module
+    NEW.module,
+    NEW.doc_type
   FROM chunks c
   WHERE c.doc_id = NEW.id;
 END;
 
+-- ==============================================================================
+-- STATS CACHE (counters for query_rag stats, kept current by triggers)
+-- ==============================================================================
+
+CREATE TABLE stats_cache (
+    key     TEXT PRIMARY KEY,
+    value   INTEGER NOT NULL DEFAULT 0
+);
+
+-- Row counts per value of a grouped column
+-- (bucket: 'doc_type', 'module', 'topic_status')
+CREATE TABLE stats_group (
+    bucket  TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (bucket, key)
+) WITHOUT ROWID;
+
+INSERT INTO stats_cache (key, value) VALUES
+    ('total_chunks', 0),
+    ('total_tokens', 0),
+    ('total_sessions', 0),
+    ('imported_sessions', 0);
+
+CREATE TRIGGER docs_stats_ai AFTER INSERT ON docs
+BEGIN
+  INSERT INTO stats_group (bucket, key, count) VALUES ('doc_type', NEW.doc_type, 1), ('module', NEW.module, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER docs_stats_ad AFTER DELETE ON docs
+BEGIN
+  UPDATE stats_group SET count = count - 1
+  WHERE (bucket = 'doc_type' AND key = OLD.doc_type) OR (bucket = 'module' AND key = OLD.module);
+  DELETE FROM stats_group WHERE bucket IN ('doc_type', 'module') AND count <= 0;
+END;
+
+CREATE TRIGGER docs_stats_au AFTER UPDATE OF doc_type, module ON docs
+BEGIN
+  UPDATE stats_group SET count = count - 1
+  WHERE (bucket = 'doc_type' AND key = OLD.doc_type) OR (bucket = 'module' AND key = OLD.module);
+  INSERT INTO stats_group (bucket, key, count) VALUES ('doc_type', NEW.doc_type, 1), ('module', NEW.module, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+  DELETE FROM stats_group WHERE bucket IN ('doc_type', 'module') AND count <= 0;
+END;
+
+CREATE TRIGGER chunks_stats_ai AFTER INSERT ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value + 1 WHERE key = 'total_chunks';
+  UPDATE stats_cache SET value = value + COALESCE(NEW.token_est, 0) WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER chunks_stats_ad AFTER DELETE ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value - 1 WHERE key = 'total_chunks';
+  UPDATE stats_cache SET value = value - COALESCE(OLD.token_est, 0) WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER chunks_stats_au AFTER UPDATE OF token_est ON chunks
+BEGIN
+  UPDATE stats_cache SET value = value + COALESCE(NEW.token_est, 0) - COALESCE(OLD.token_est, 0)
+  WHERE key = 'total_tokens';
+END;
+
+CREATE TRIGGER topics_stats_ai AFTER INSERT ON topics
+BEGIN
+  INSERT INTO stats_group (bucket, key, count) VALUES ('topic_status', NEW.status, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER topics_stats_ad AFTER DELETE ON topics
+BEGIN
+  UPDATE stats_group SET count = count - 1 WHERE bucket = 'topic_status' AND key = OLD.status;
+  DELETE FROM stats_group WHERE bucket = 'topic_status' AND count <= 0;
+END;
+
+CREATE TRIGGER topics_stats_au AFTER UPDATE OF status ON topics
+BEGIN
+  UPDATE stats_group SET count = count - 1 WHERE bucket = 'topic_status' AND key = OLD.status;
+  INSERT INTO stats_group (bucket, key, count) VALUES ('topic_status', NEW.status, 1)
+  ON CONFLICT (bucket, key) DO UPDATE SET count = count + 1;
+  DELETE FROM stats_group WHERE bucket = 'topic_status' AND count <= 0;
+END;
+
+CREATE TRIGGER sessions_stats_ai AFTER INSERT ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value + 1 WHERE key = 'total_sessions';
+  UPDATE stats_cache SET value = value + NEW.imported_to_docs WHERE key = 'imported_sessions';
+END;
+
+CREATE TRIGGER sessions_stats_ad AFTER DELETE ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value - 1 WHERE key = 'total_sessions';
+  UPDATE stats_cache SET value = value - OLD.imported_to_docs WHERE key = 'imported_sessions';
+END;
+
+CREATE TRIGGER sessions_stats_au AFTER UPDATE OF imported_to_docs ON sessions
+BEGIN
+  UPDATE stats_cache SET value = value + NEW.imported_to_docs - OLD.imported_to_docs
+  WHERE key = 'imported_sessions';
+END;
+
 -- ==============================================================================
 -- VIEWS
 -- ==============================================================================
@@ -466,8 +609,8 @@ SELECT '✓ Schema v2.2 loaded (JSONB dual-column)!' AS status,
        '✓ FTS5: contentless mode with proper triggers' AS fts,
        '✓ JSONB: dual-column (TEXT + BLOB) for metadata' AS jsonb,
        '✓ Auto-sync: TEXT → JSONB triggers' AS sync,
-       '✓ Tables: topics, sessions, messages, docs, chunks' AS tables,
-       '✓ Triggers: chunks_fts_*, docs_fts_au, *_metadata_sync_*' AS triggers,
+       '✓ Tables: topics, sessions, messages, docs, chunks, stats_cache, stats_group' AS tables,
+       '✓ Triggers: chunks_fts_*, docs_fts_au, *_metadata_sync_*, *_stats_*' AS triggers,
        '✓ Views: chunks_with_docs, active_topics, session_summaries' AS views,
        '✓ Seed: 7 topics' AS seed,
        '✓ Requires: SQLite 3.51.0+' AS requirements;
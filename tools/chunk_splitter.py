@@ -19,25 +19,173 @@ Usage:
     # Split markdown file
     python chunk_splitter.py from-markdown --input README.md --output chunks.json
 
+    # Split every markdown file in a directory (one process per CPU)
+    python chunk_splitter.py from-markdown-dir --input-dir docs/ --output-dir chunks/
+
     # Split and import directly to database
     python chunk_splitter.py from-session --session-id 1 --import --doc-id 1
 
+Optional dependencies:
+    tiktoken - exact token counts (falls back to a word-count heuristic)
+    xxhash - XXH3 chunk hashes with --hash xxh3 (default is BLAKE2b)
+
 Author: Claude (AI System Architect)
 Created: 2025-11-22
 Version: 1.0.0
 """
 
 import sqlite3
-import re
 import json
 import argparse
 import sys
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+import os
+import io
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Dict, Iterator, Optional, Tuple
+from dataclasses import dataclass
 import hashlib
 
+from conn_cache import get_cached_conn
+
+try:
+    import tiktoken
+except ImportError:  # optional - fall back to word-count heuristic
+    tiktoken = None
+
+try:
+    import xxhash
+except ImportError:  # optional - only needed for hash_algo='xxh3'
+    xxhash = None
+
+
+# Section header levels recognised by the markdown splitter
+_HEADER_LEVELS = ('###', '##')
+
+
+def _digest(data: bytes) -> str:
+    """BLAKE2b-128 hex digest used for chunk dedup hashes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _xxh3_digest(data: bytes) -> str:
+    """XXH3-128 hex digest (same 32-char width as _digest)."""
+    return xxhash.xxh3_128_hexdigest(data)
+
+
+# Chunk hash functions by name. Dedup compares stored hashes, so a
+# database should stick to one algorithm (blake2b unless chosen otherwise).
+_HASH_FUNCS = {'blake2b': _digest, 'xxh3': _xxh3_digest}
+
+
+def _parse_header(line: str) -> Optional[Tuple[str, str]]:
+    """
+    Parse a ## / ### header line.
+
+    Args:
+        line: Single line, with or without its trailing newline
+
+    Returns:
+        (level, heading) tuple, or None if the line is not a header
+    """
+    for level in _HEADER_LEVELS:
+        if line.startswith(level):
+            rest = line[len(level):]
+            if rest[:1] not in (' ', '\t'):
+                return None
+            heading = rest.rstrip('\n').lstrip()
+            return (level, heading) if heading else None
+    return None
+
+
+def _iter_sections(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], Optional[str], str]]:
+    """
+    Group markdown lines into header sections in a single pass.
+
+    The first section is the content before any header and has no level
+    or heading; it is always yielded, possibly empty.
+
+    Args:
+        lines: Markdown lines with line endings kept
+
+    Yields:
+        (level, heading, content) tuples in document order
+    """
+    level = heading = None
+    buf: List[str] = []
+
+    for line in lines:
+        header = _parse_header(line) if line.startswith('##') else None
+        if header:
+            yield level, heading, ''.join(buf)
+            (level, heading), buf = header, []
+        else:
+            buf.append(line)
+
+    yield level, heading, ''.join(buf)
+
+
+def _split_paragraphs(text: str) -> List[str]:
+    r"""
+    Split text into paragraphs on runs of blank lines.
 
-@dataclass
+    Same result as re.split(r'\n\n+', text) minus empty pieces, but done
+    with str.split in C instead of the regex engine. An odd-length newline
+    run leaves one '\n' at the start of the following piece; it is dropped.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of non-empty paragraphs
+    """
+    pieces = text.split('\n\n')
+    paragraphs = [pieces[0]] if pieces[0] else []
+    for piece in pieces[1:]:
+        if piece.startswith('\n'):
+            piece = piece[1:]
+        if piece:
+            paragraphs.append(piece)
+    return paragraphs
+
+
+def _chunk_by_budget(
+    para_tokens: List[int],
+    max_tokens: int,
+    start_tokens: int = 0
+) -> List[Tuple[int, int, int]]:
+    """
+    Group consecutive paragraphs under a token budget.
+
+    Integer-only core of the paragraph splitters: it never touches the
+    paragraph strings, so callers slice and join each range once.
+
+    Args:
+        para_tokens: Token estimate per paragraph
+        max_tokens: Budget per chunk
+        start_tokens: Tokens already in the first chunk (e.g. its heading)
+
+    Returns:
+        (start, end, token_est) paragraph ranges in order; the first
+        range may be empty
+    """
+    ranges = []
+    start = 0
+    current = start_tokens
+
+    for i, tokens in enumerate(para_tokens):
+        if current + tokens > max_tokens:
+            ranges.append((start, i, current))
+            start, current = i, tokens
+        else:
+            current += tokens
+
+    ranges.append((start, len(para_tokens), current))
+    return ranges
+
+
+@dataclass(slots=True)
 class Chunk:
     """Represents a single chunk of content."""
     heading: Optional[str]
@@ -50,10 +198,16 @@ class Chunk:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        d = asdict(self)
-        if self.metadata:
-            d['metadata'] = json.dumps(self.metadata)
-        return d
+        # Built by hand: dataclasses.asdict deep-copies every field
+        return {
+            'heading': self.heading,
+            'text': self.text,
+            'ord': self.ord,
+            'kind': self.kind,
+            'token_est': self.token_est,
+            'hash': self.hash,
+            'metadata': json.dumps(self.metadata) if self.metadata else self.metadata,
+        }
 
 
 class ChunkSplitter:
@@ -63,7 +217,9 @@ class ChunkSplitter:
         self,
         max_chunk_tokens: int = 500,
         min_chunk_tokens: int = 50,
-        overlap_tokens: int = 50
+        overlap_tokens: int = 50,
+        encoding_name: str = "cl100k_base",
+        hash_algo: str = "blake2b"
     ):
         """
         Initialize chunk splitter.
@@ -72,17 +228,36 @@ class ChunkSplitter:
             max_chunk_tokens: Maximum tokens per chunk
             min_chunk_tokens: Minimum tokens per chunk (avoid tiny chunks)
             overlap_tokens: Overlap between adjacent chunks (context continuity)
+            encoding_name: tiktoken encoding used when tiktoken is installed
+            hash_algo: Chunk hash, 'blake2b' or 'xxh3' (needs xxhash)
         """
+        if hash_algo not in _HASH_FUNCS:
+            raise ValueError(f"Unknown hash_algo: {hash_algo}. Available: {', '.join(_HASH_FUNCS)}")
+        if hash_algo == 'xxh3' and xxhash is None:
+            raise ImportError("hash_algo='xxh3' requires the xxhash package")
+
         self.max_chunk_tokens = max_chunk_tokens
         self.min_chunk_tokens = min_chunk_tokens
         self.overlap_tokens = overlap_tokens
-
-    @staticmethod
-    def estimate_tokens(text: str) -> int:
+        self.encoding_name = encoding_name
+        self.hash_algo = hash_algo
+        self._hash = _HASH_FUNCS[hash_algo]
+        self._enc = None  # tiktoken encoding, loaded on first use
+
+    def _encoding(self):
+        """Return the tiktoken encoding, or None if tiktoken is unavailable."""
+        if tiktoken is None:
+            return None
+        if self._enc is None:
+            self._enc = tiktoken.get_encoding(self.encoding_name)
+        return self._enc
+
+    def estimate_tokens(self, text: str) -> int:
         """
-        Rough token estimation (words * 1.3 as approximation).
+        Token count for text.
 
-        For production, use tiktoken or similar.
+        Uses tiktoken when installed; otherwise a rough estimate
+        (words * 1.3 as approximation).
 
         Args:
             text: Input text
@@ -90,22 +265,163 @@ class ChunkSplitter:
         Returns:
             Estimated token count
         """
+        enc = self._encoding()
+        if enc is not None:
+            return len(enc.encode_ordinary(text))
+
         # Simple heuristic: ~1.3 tokens per word for English
         words = len(text.split())
         return int(words * 1.3)
 
-    @staticmethod
-    def compute_hash(text: str) -> str:
+    def estimate_tokens_batch(self, texts: List[str]) -> List[int]:
         """
-        Compute SHA256 hash of text for deduplication.
+        Token counts for many texts at once.
+
+        With tiktoken the whole list is encoded in one batched call.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            Token count per text, in input order
+        """
+        enc = self._encoding()
+        if enc is not None:
+            return [len(tokens) for tokens in enc.encode_ordinary_batch(texts)]
+
+        return [int(len(text.split()) * 1.3) for text in texts]
+
+    def compute_hash(self, text: str) -> str:
+        """
+        Compute the 128-bit dedup hash of text (BLAKE2b, or XXH3).
+
+        Dedup does not need a cryptographic-strength digest; BLAKE2b is
+        faster than SHA256 in CPython and the 128-bit digest keeps the
+        hash column and its index small. XXH3 is faster still.
 
         Args:
             text: Input text
 
         Returns:
-            Hex digest of SHA256 hash
+            Hex digest (32 chars)
+        """
+        return self._hash(text.encode('utf-8'))
+
+    def _finalize_chunk(
+        self,
+        text_parts: List[str],
+        heading: Optional[str],
+        kind: str,
+        ord: int,
+        token_est: int,
+        metadata: Optional[Dict] = None
+    ) -> Optional[Chunk]:
+        """
+        Join buffered paragraphs into a Chunk.
+
+        The text is UTF-8 encoded once here and the bytes are hashed
+        directly, instead of each consumer re-encoding the string.
+
+        Args:
+            text_parts: Buffered paragraphs
+            heading: Chunk heading
+            kind: Chunk kind
+            ord: Order within document
+            token_est: Token count tracked while buffering
+            metadata: Optional chunk metadata
+
+        Returns:
+            Chunk, or None if the buffer holds only whitespace
+        """
+        if not text_parts:
+            return None
+        text = "\n\n".join(text_parts)
+        # Only the outer edges of the joined text can carry strippable
+        # whitespace; skip the full-length strip() when both are clean
+        needs_strip = text_parts[0][:1].isspace() or text_parts[-1][-1:].isspace()
+        if needs_strip:
+            text = text.strip()
+            if not text:
+                return None
+        encoded = text.encode('utf-8')
+        return Chunk(
+            heading=heading,
+            text=text,
+            ord=ord,
+            kind=kind,
+            token_est=token_est,
+            hash=self._hash(encoded),
+            metadata=metadata
+        )
+
+    def _split_section(
+        self,
+        level: Optional[str],
+        heading: Optional[str],
+        content: str,
+        ord_start: int
+    ) -> List[Chunk]:
+        """
+        Turn one markdown section into chunks.
+
+        Args:
+            level: Header marker ('##' or '###'), None for pre-header content
+            heading: Header text, None for pre-header content
+            content: Section body, already stripped
+            ord_start: ord assigned to the first chunk
+
+        Returns:
+            List of chunks (empty if the section has no text)
         """
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+        chunks = []
+        ord_counter = ord_start
+
+        if level is None:
+            # Pre-content (before first header)
+            if content:
+                chunks.append(Chunk(
+                    heading=None,
+                    text=content,
+                    ord=ord_counter,
+                    kind='doc',
+                    token_est=self.estimate_tokens(content),
+                    hash=self.compute_hash(content)
+                ))
+            return chunks
+
+        full_text = f"{level} {heading}\n\n{content}"
+        token_est = self.estimate_tokens(full_text)
+
+        if token_est <= self.max_chunk_tokens:
+            # Chunk is within limit
+            chunks.append(Chunk(
+                heading=heading,
+                text=full_text,
+                ord=ord_counter,
+                kind='doc',
+                token_est=token_est,
+                hash=self.compute_hash(full_text)
+            ))
+            return chunks
+
+        # Chunk is too large, split content by paragraphs;
+        # the heading seeds the first chunk's budget
+        paragraphs = _split_paragraphs(content)
+        heading_tokens = self.estimate_tokens(f"{level} {heading}")
+        ranges = _chunk_by_budget(
+            self.estimate_tokens_batch(paragraphs), self.max_chunk_tokens, heading_tokens
+        )
+
+        for i, (start, end, tokens) in enumerate(ranges):
+            buf = paragraphs[start:end]
+            if i == 0:
+                buf.insert(0, f"{level} {heading}")
+            chunk = self._finalize_chunk(buf, heading, 'doc', ord_counter, tokens)
+            if chunk:
+                chunks.append(chunk)
+                ord_counter += 1
+
+        return chunks
 
     def split_markdown(self, markdown: str) -> List[Chunk]:
         """
@@ -122,98 +438,41 @@ class ChunkSplitter:
         Returns:
             List of chunks
         """
-        chunks = []
-        # Regex to match headers (## or ### ...)
-        header_pattern = re.compile(r'^(#{2,3})\s+(.+)$', re.MULTILINE)
+        chunks: List[Chunk] = []
 
-        # Split into sections
-        sections = header_pattern.split(markdown)
+        # Lines split on '\n' only, matching how headers are delimited
+        for level, heading, content in _iter_sections(io.StringIO(markdown, newline='\n')):
+            chunks.extend(self._split_section(level, heading, content.strip(), len(chunks)))
 
-        # sections format: [pre_content, level1, heading1, content1, level2, heading2, content2, ...]
-        current_heading = None
-        current_level = None
-        ord_counter = 0
+        return chunks
 
-        i = 0
-        while i < len(sections):
-            if i == 0:
-                # Pre-content (before first header)
-                text = sections[i].strip()
-                if text:
-                    chunks.append(Chunk(
-                        heading=None,
-                        text=text,
-                        ord=ord_counter,
-                        kind='doc',
-                        token_est=self.estimate_tokens(text),
-                        hash=self.compute_hash(text)
-                    ))
-                    ord_counter += 1
-                i += 1
-            else:
-                # level, heading, content
-                if i + 2 < len(sections):
-                    level = sections[i]
-                    heading = sections[i + 1]
-                    content = sections[i + 2].strip()
-
-                    full_text = f"{level} {heading}\n\n{content}"
-                    token_est = self.estimate_tokens(full_text)
-
-                    # If chunk is too large, split content into paragraphs
-                    if token_est > self.max_chunk_tokens:
-                        # Split content by paragraphs
-                        paragraphs = re.split(r'\n\n+', content)
-                        current_chunk_text = f"{level} {heading}\n\n"
-                        current_tokens = self.estimate_tokens(current_chunk_text)
-
-                        for para in paragraphs:
-                            para_tokens = self.estimate_tokens(para)
-                            if current_tokens + para_tokens > self.max_chunk_tokens:
-                                # Flush current chunk
-                                if current_chunk_text.strip():
-                                    chunks.append(Chunk(
-                                        heading=heading,
-                                        text=current_chunk_text.strip(),
-                                        ord=ord_counter,
-                                        kind='doc',
-                                        token_est=self.estimate_tokens(current_chunk_text),
-                                        hash=self.compute_hash(current_chunk_text)
-                                    ))
-                                    ord_counter += 1
-                                # Start new chunk
-                                current_chunk_text = para + "\n\n"
-                                current_tokens = para_tokens
-                            else:
-                                current_chunk_text += para + "\n\n"
-                                current_tokens += para_tokens
-
-                        # Flush remaining
-                        if current_chunk_text.strip():
-                            chunks.append(Chunk(
-                                heading=heading,
-                                text=current_chunk_text.strip(),
-                                ord=ord_counter,
-                                kind='doc',
-                                token_est=self.estimate_tokens(current_chunk_text),
-                                hash=self.compute_hash(current_chunk_text)
-                            ))
-                            ord_counter += 1
-                    else:
-                        # Chunk is within limit
-                        chunks.append(Chunk(
-                            heading=heading,
-                            text=full_text,
-                            ord=ord_counter,
-                            kind='doc',
-                            token_est=token_est,
-                            hash=self.compute_hash(full_text)
-                        ))
-                        ord_counter += 1
-
-                i += 3
+    def split_markdown_stream(self, stream) -> Iterator[Chunk]:
+        """
+        Split markdown read line by line from a binary stream.
 
-        return chunks
+        Same sections as split_markdown, but only the current section is
+        held in memory and chunks are yielded as each section completes.
+        Pass an mmap (or any object with a bytes readline()) to chunk
+        files without reading them into a single string.
+
+        Args:
+            stream: Binary stream of UTF-8 markdown (e.g. mmap.mmap)
+
+        Yields:
+            Chunks in document order
+        """
+        def lines():
+            for raw in iter(stream.readline, b''):
+                line = raw.decode('utf-8')
+                if line.endswith('\r\n'):
+                    line = line[:-2] + '\n'
+                yield line
+
+        ord_counter = 0
+        for level, heading, content in _iter_sections(lines()):
+            for chunk in self._split_section(level, heading, content.strip(), ord_counter):
+                yield chunk
+                ord_counter += 1
 
     def split_plaintext(self, text: str, kind: str = 'doc') -> List[Chunk]:
         """
@@ -226,47 +485,48 @@ class ChunkSplitter:
         Returns:
             List of chunks
         """
-        chunks = []
-        paragraphs = re.split(r'\n\n+', text)
+        return list(self.split_plaintext_into(text, kind=kind))
 
-        current_chunk = ""
-        current_tokens = 0
-        ord_counter = 0
+    def split_plaintext_into(
+        self,
+        text: str,
+        kind: str = 'doc',
+        ord_start: int = 0,
+        metadata_base: Optional[Dict] = None
+    ) -> Iterator[Chunk]:
+        """
+        Split plain text into chunks by paragraphs, yielding final chunks.
 
-        for para in paragraphs:
-            para_tokens = self.estimate_tokens(para)
-
-            if current_tokens + para_tokens > self.max_chunk_tokens:
-                # Flush current chunk
-                if current_chunk.strip():
-                    chunks.append(Chunk(
-                        heading=None,
-                        text=current_chunk.strip(),
-                        ord=ord_counter,
-                        kind=kind,
-                        token_est=self.estimate_tokens(current_chunk),
-                        hash=self.compute_hash(current_chunk)
-                    ))
-                    ord_counter += 1
-                # Start new chunk
-                current_chunk = para + "\n\n"
-                current_tokens = para_tokens
-            else:
-                current_chunk += para + "\n\n"
-                current_tokens += para_tokens
+        Each chunk is built with its final ord and metadata, so callers
+        embedding the result in a larger document don't need to patch
+        chunks after the fact.
 
-        # Flush remaining
-        if current_chunk.strip():
-            chunks.append(Chunk(
-                heading=None,
-                text=current_chunk.strip(),
-                ord=ord_counter,
-                kind=kind,
-                token_est=self.estimate_tokens(current_chunk),
-                hash=self.compute_hash(current_chunk)
-            ))
+        Args:
+            text: Plain text content
+            kind: Chunk kind ('doc', 'ai', 'note')
+            ord_start: ord of the first chunk
+            metadata_base: If given, each chunk gets
+                {**metadata_base, 'sub_chunk': i}
 
-        return chunks
+        Yields:
+            Chunks in text order
+        """
+        paragraphs = _split_paragraphs(text)
+        ranges = _chunk_by_budget(self.estimate_tokens_batch(paragraphs), self.max_chunk_tokens)
+        sub_chunk = 0
+
+        def metadata():
+            if metadata_base is None:
+                return None
+            return {**metadata_base, 'sub_chunk': sub_chunk}
+
+        for start, end, tokens in ranges:
+            chunk = self._finalize_chunk(
+                paragraphs[start:end], None, kind, ord_start + sub_chunk, tokens, metadata()
+            )
+            if chunk:
+                yield chunk
+                sub_chunk += 1
 
     def split_session_messages(
         self,
@@ -305,10 +565,11 @@ class ChunkSplitter:
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
-        # Get messages
+        # Get messages - only the needed columns, as plain tuples
+        conn.row_factory = None
         messages = conn.execute(
             """
-            SELECT * FROM messages
+            SELECT role, step, content FROM messages
             WHERE session_id = ?
             ORDER BY step
             """,
@@ -320,31 +581,26 @@ class ChunkSplitter:
         chunks = []
         ord_counter = 0
 
-        # Process messages
-        for msg in messages:
-            content = msg['content']
-            role = msg['role']
-            step = msg['step']
+        # Estimate tokens for all messages in one batch
+        token_ests = self.estimate_tokens_batch([content for _, _, content in messages])
 
+        # Process messages
+        for (role, step, content), token_est in zip(messages, token_ests):
             # Determine chunk kind based on role
             kind = 'ai' if role == 'assistant' else 'note'
 
-            # Estimate tokens
-            token_est = self.estimate_tokens(content)
-
             # If message is too long, split it
             if token_est > self.max_chunk_tokens:
-                sub_chunks = self.split_plaintext(content, kind=kind)
-                for i, chunk in enumerate(sub_chunks):
-                    chunk.ord = ord_counter
-                    chunk.metadata = {
-                        'session_id': session_id,
-                        'message_step': step,
-                        'message_role': role,
-                        'sub_chunk': i
-                    }
-                    chunks.append(chunk)
-                    ord_counter += 1
+                metadata_base = {
+                    'session_id': session_id,
+                    'message_step': step,
+                    'message_role': role
+                }
+                before = len(chunks)
+                chunks.extend(self.split_plaintext_into(
+                    content, kind=kind, ord_start=ord_counter, metadata_base=metadata_base
+                ))
+                ord_counter += len(chunks) - before
             else:
                 # Single chunk from message
                 chunks.append(Chunk(
@@ -376,6 +632,152 @@ class ChunkSplitter:
         return chunks, session_metadata
 
 
+def _map_file(f):
+    """
+    Memory-map an open binary file read-only.
+
+    Empty files cannot be mapped, so they get an empty in-memory stream.
+
+    Args:
+        f: File opened in binary mode
+
+    Returns:
+        mmap.mmap (or io.BytesIO for empty files), usable as a context manager
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return io.BytesIO(b'')
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _write_chunks_json(f, chunks: Iterable[Chunk]) -> int:
+    """
+    Write chunks to f as a JSON array, one chunk at a time.
+
+    Args:
+        f: Text file opened for writing
+        chunks: Chunks (list or generator)
+
+    Returns:
+        Number of chunks written
+    """
+    encoder = json.JSONEncoder(indent=2)
+    count = 0
+    f.write('[')
+    for chunk in chunks:
+        f.write(',\n' if count else '\n')
+        f.writelines(encoder.iterencode(chunk.to_dict()))
+        count += 1
+    f.write('\n]' if count else ']')
+    return count
+
+
+def _chunk_one_file(path: str, output_path: str, splitter_config: Dict) -> Tuple[str, int]:
+    """
+    Split one markdown file and write its chunks to output_path.
+
+    Runs in a worker process, so it builds its own ChunkSplitter.
+
+    Args:
+        path: Markdown file path
+        output_path: JSON output file
+        splitter_config: ChunkSplitter keyword arguments
+
+    Returns:
+        (output_path, chunk_count)
+    """
+    splitter = ChunkSplitter(**splitter_config)
+
+    with open(path, 'rb') as f, _map_file(f) as data:
+        with open(output_path, 'w') as out:
+            count = _write_chunks_json(out, splitter.split_markdown_stream(data))
+
+    return output_path, count
+
+
+def split_markdown_dir(
+    input_dir: str,
+    output_dir: str,
+    splitter_config: Optional[Dict] = None,
+    max_workers: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    """
+    Split all markdown files in a directory in parallel.
+
+    Files are independent, so each one goes to a separate worker process.
+    Each file's chunks go to <output_dir>/<relative path>.json, keeping the
+    extension so that e.g. notes.md and notes.markdown don't overwrite
+    each other.
+
+    Args:
+        input_dir: Directory with *.md / *.markdown files (not recursive)
+        output_dir: Directory for per-file JSON output (created if missing)
+        splitter_config: ChunkSplitter keyword arguments
+        max_workers: Worker processes (default: os.cpu_count())
+
+    Returns:
+        List of (output_path, chunk_count), in input file order
+    """
+    paths = sorted(
+        str(p) for p in Path(input_dir).iterdir()
+        if p.is_file() and p.suffix.lower() in ('.md', '.markdown')
+    )
+    os.makedirs(output_dir, exist_ok=True)
+    config = splitter_config or {}
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        futures = [
+            ex.submit(
+                _chunk_one_file, path,
+                os.path.join(output_dir, os.path.relpath(path, input_dir) + '.json'),
+                config
+            )
+            for path in paths
+        ]
+        return [future.result() for future in futures]
+
+
+def ensure_chunk_dedup_index(conn: sqlite3.Connection) -> None:
+    """
+    Create the UNIQUE(doc_id, hash) index that chunk inserts rely on.
+
+    Schemas include it; this covers databases created before it was
+    added. A no-op if the index exists or there is no chunks table yet.
+
+    Args:
+        conn: Open connection
+
+    Raises:
+        RuntimeError: If existing duplicate chunks prevent the index
+    """
+    has_chunks = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks'"
+    ).fetchone()
+    if not has_chunks:
+        return
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_chunks_doc_hash ON chunks(doc_id, hash)")
+    except sqlite3.IntegrityError as e:
+        raise RuntimeError(
+            "chunks has duplicate (doc_id, hash) rows; "
+            "run schemas/migrations/add_chunks_doc_hash_unique.sql first"
+        ) from e
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """Cached connection for import_chunks_to_db."""
+    return get_cached_conn(
+        db_path,
+        """
+            PRAGMA foreign_keys = ON;
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;  -- 64 MB page cache
+        """,
+        on_open=ensure_chunk_dedup_index
+    )
+
+
 def import_chunks_to_db(
     db_path: str,
     doc_id: int,
@@ -384,35 +786,43 @@ def import_chunks_to_db(
     """
     Import chunks directly to database.
 
+    The connection is cached per db_path, so importing many documents
+    in a loop pays the connect and PRAGMA setup only once.
+
     Args:
         db_path: Path to SQLite database
         doc_id: Document ID to attach chunks to
         chunks: List of chunks
 
     Returns:
-        Number of chunks inserted
+        Number of chunks inserted (duplicates of existing chunks are skipped)
     """
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON")
-
-    count = 0
-    for chunk in chunks:
-        metadata_json = json.dumps(chunk.metadata) if chunk.metadata else None
-
-        conn.execute(
+    conn = _get_conn(db_path)
+
+    # Build all parameter rows (incl. metadata JSON) before touching SQLite,
+    # so the insert loop runs entirely inside executemany
+    rows = [
+        (doc_id, chunk.ord, chunk.heading, chunk.text, chunk.token_est,
+         chunk.kind, chunk.hash,
+         json.dumps(chunk.metadata) if chunk.metadata else None)
+        for chunk in chunks
+    ]
+
+    # One write transaction (commit/rollback via context manager);
+    # executemany prepares the INSERT once. Chunks whose hash already
+    # exists for this doc are skipped by the unique (doc_id, hash) index.
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.executemany(
             """
             INSERT INTO chunks (doc_id, ord, heading, text, token_est, kind, hash, metadata)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(doc_id, hash) DO NOTHING
             """,
-            (doc_id, chunk.ord, chunk.heading, chunk.text,
-             chunk.token_est, chunk.kind, chunk.hash, metadata_json)
+            rows
         )
-        count += 1
 
-    conn.commit()
-    conn.close()
-
-    return count
+    return cursor.rowcount
 
 
 def main():
@@ -423,6 +833,8 @@ def main():
     )
 
     parser.add_argument('--db', default='sqlite_knowledge.db', help='Database path')
+    parser.add_argument('--hash', default='blake2b', choices=list(_HASH_FUNCS),
+                        help='Chunk hash algorithm (default: blake2b; xxh3 needs xxhash)')
 
     subparsers = parser.add_subparsers(dest='command', help='Command')
 
@@ -451,13 +863,20 @@ def main():
     text_parser.add_argument('--doc-id', type=int, help='Document ID (required with --import)')
     text_parser.add_argument('--kind', default='doc', help='Chunk kind (default: doc)')
 
+    # from-markdown-dir
+    dir_parser = subparsers.add_parser('from-markdown-dir',
+                                       help='Split all markdown files in a directory (parallel)')
+    dir_parser.add_argument('--input-dir', required=True, help='Directory with markdown files')
+    dir_parser.add_argument('--output-dir', required=True, help='Directory for JSON output')
+    dir_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    splitter = ChunkSplitter()
+    splitter = ChunkSplitter(hash_algo=args.hash)
 
     # Execute command
     if args.command == 'from-session':
@@ -466,10 +885,11 @@ def main():
 
         if args.output:
             with open(args.output, 'w') as f:
-                json.dump({
-                    'chunks': [c.to_dict() for c in chunks],
-                    'session_metadata': session_meta
-                }, f, indent=2)
+                f.write('{\n"chunks": ')
+                _write_chunks_json(f, chunks)
+                f.write(',\n"session_metadata": ')
+                json.dump(session_meta, f, indent=2)
+                f.write('\n}')
             print(f"✓ Saved to {args.output}")
 
         if args.import_db:
@@ -480,16 +900,21 @@ def main():
             print(f"✓ Imported {count} chunks to doc_id={args.doc_id}")
 
     elif args.command == 'from-markdown':
-        with open(args.input, 'r') as f:
-            markdown = f.read()
-
-        chunks = splitter.split_markdown(markdown)
-        print(f"✓ Split markdown into {len(chunks)} chunks")
-
-        if args.output:
-            with open(args.output, 'w') as f:
-                json.dump([c.to_dict() for c in chunks], f, indent=2)
-            print(f"✓ Saved to {args.output}")
+        with open(args.input, 'rb') as f, _map_file(f) as data:
+            chunks = splitter.split_markdown_stream(data)
+            if args.import_db:
+                # Needed again for the import, so keep them
+                chunks = list(chunks)
+
+            if args.output:
+                # Chunks are written as they are produced
+                with open(args.output, 'w') as out:
+                    count = _write_chunks_json(out, chunks)
+                print(f"✓ Split markdown into {count} chunks")
+                print(f"✓ Saved to {args.output}")
+            else:
+                chunks = list(chunks)
+                print(f"✓ Split markdown into {len(chunks)} chunks")
 
         if args.import_db:
             if not args.doc_id:
@@ -507,7 +932,7 @@ def main():
 
         if args.output:
             with open(args.output, 'w') as f:
-                json.dump([c.to_dict() for c in chunks], f, indent=2)
+                _write_chunks_json(f, chunks)
             print(f"✓ Saved to {args.output}")
 
         if args.import_db:
@@ -517,6 +942,16 @@ def main():
             count = import_chunks_to_db(args.db, args.doc_id, chunks)
             print(f"✓ Imported {count} chunks to doc_id={args.doc_id}")
 
+    elif args.command == 'from-markdown-dir':
+        results = split_markdown_dir(
+            args.input_dir, args.output_dir,
+            splitter_config={'hash_algo': args.hash},
+            max_workers=args.workers
+        )
+        for output_path, count in results:
+            print(f"✓ {output_path}: {count} chunks")
+        print(f"✓ Split {len(results)} files into {sum(c for _, c in results)} chunks")
+
 
 if __name__ == '__main__':
     main()
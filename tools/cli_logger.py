@@ -22,6 +22,10 @@ Usage:
     # Interactive mode (recommended)
     python cli_logger.py interactive --topic-id 1
 
+    # Keep one logger process running; start/log-*/end/list calls made
+    # while it is up are forwarded to it over a Unix socket
+    python cli_logger.py daemon
+
 Author: Claude (AI System Architect)
 Created: 2025-11-22
 Version: 1.0.0
@@ -29,37 +33,136 @@ Version: 1.0.0
 
 import sqlite3
 import sys
+import os
 import argparse
+import time
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import json
 
+from conn_cache import get_cached_conn
+import socket_daemon
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Return the shared connection for db_path, opening and tuning it on first use.
+
+    Args:
+        db_path: Path to SQLite database file
+
+    Returns:
+        Open connection (closed at interpreter exit)
+    """
+    # Larger statement cache so the log_message INSERT stays prepared
+    # when interactive use mixes in other queries. Enable foreign keys;
+    # WAL + synchronous=NORMAL make each of the many small per-message
+    # commits a single sequential append
+    return get_cached_conn(
+        db_path,
+        """
+            PRAGMA foreign_keys = ON;
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -64000;
+            PRAGMA mmap_size = 268435456;
+        """,
+        cached_statements=512,
+        row_factory=sqlite3.Row
+    )
+
 
 class CLILogger:
     """Handles logging of CLI conversations to SQLite database."""
 
-    def __init__(self, db_path: str = "sqlite_knowledge.db"):
+    # Group commit for replayed interactive input: commit after this many
+    # messages or once the oldest uncommitted one is this old
+    GROUP_COMMIT_MESSAGES = 16
+    GROUP_COMMIT_SECONDS = 1.0
+
+    def __init__(
+        self,
+        db_path: str = "sqlite_knowledge.db",
+        conn: Optional[sqlite3.Connection] = None,
+        verbose: bool = True
+    ):
         """
         Initialize CLI logger.
 
         Args:
             db_path: Path to SQLite database file
+            conn: Open connection to use instead of the shared one for
+                db_path (its row_factory is set to sqlite3.Row)
+            verbose: Print progress messages (written out on exit, or
+                before each prompt in interactive mode)
         """
         self.db_path = db_path
+        self._external_conn = conn
+        self.verbose = verbose
         self.conn = None
+        # Progress lines, written in one go by _flush_log
+        self._out_buffer: List[str] = []
+        # Last step per session for messages still pending in our open write
+        # transaction, so group-committed messages skip the MAX(step) probe
+        self._step_cache: Dict[int, int] = {}
+        # Topic titles by id (titles are looked up once per topic)
+        self._topic_cache: Dict[int, Optional[str]] = {}
+        # Messages logged with commit=False and not yet committed
+        self._pending = 0
+        self._pending_since = 0.0
 
     def __enter__(self):
         """Context manager entry - connect to database."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        # Enable foreign keys
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        if self._external_conn is not None:
+            self.conn = self._external_conn
+            self.conn.row_factory = sqlite3.Row
+        else:
+            # Shared per database across CLILogger instances in this process
+            self.conn = _get_conn(self.db_path)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Context manager exit - keep the connection open for reuse."""
+        if self.conn and self.conn.in_transaction:
+            self.conn.rollback()
+            # Cached steps may include rolled-back messages
+            self._step_cache.clear()
+        self.conn = None
+        self._flush_log()
+
+    def _log(self, message: str) -> None:
+        """Queue a progress line for output (dropped unless verbose)."""
+        if self.verbose:
+            self._out_buffer.append(message + '\n')
+
+    def _flush_log(self, stream=None) -> None:
+        """
+        Write queued progress lines with a single write.
+
+        Args:
+            stream: File to write to (default: sys.stdout)
+        """
+        if self._out_buffer:
+            stream = stream or sys.stdout
+            stream.write(''.join(self._out_buffer))
+            stream.flush()
+            self._out_buffer.clear()
+
+    def _commit_pending(self, force: bool = False) -> None:
+        """
+        Commit messages logged with commit=False once a group-commit limit is hit.
+
+        Args:
+            force: Commit whatever is pending regardless of limits
+        """
+        if not self._pending:
+            return
+        if (force
+                or self._pending >= self.GROUP_COMMIT_MESSAGES
+                or time.monotonic() - self._pending_since >= self.GROUP_COMMIT_SECONDS):
+            self.conn.commit()
+            self._pending = 0
 
     def start_session(
         self,
@@ -88,23 +191,39 @@ class CLILogger:
         self.conn.commit()
         session_id = cursor.lastrowid
 
-        print(f"✓ Started session {session_id}")
+        self._log(f"✓ Started session {session_id}")
         if topic_id:
-            topic = self.conn.execute(
-                "SELECT title FROM topics WHERE id = ?", (topic_id,)
-            ).fetchone()
-            if topic:
-                print(f"  Topic: {topic['title']}")
+            title = self._topic_title(topic_id)
+            if title:
+                self._log(f"  Topic: {title}")
 
         return session_id
 
+    def _topic_title(self, topic_id: int) -> Optional[str]:
+        """
+        Title of a topic, cached per CLILogger.
+
+        Args:
+            topic_id: Topic ID
+
+        Returns:
+            Topic title, or None if there is no such topic
+        """
+        if topic_id not in self._topic_cache:
+            row = self.conn.execute(
+                "SELECT title FROM topics WHERE id = ?", (topic_id,)
+            ).fetchone()
+            self._topic_cache[topic_id] = row['title'] if row else None
+        return self._topic_cache[topic_id]
+
     def log_message(
         self,
         session_id: int,
         role: str,
         content: str,
         tokens: Optional[int] = None,
-        metadata: Optional[dict] = None
+        metadata: Optional[dict] = None,
+        commit: bool = True
     ) -> int:
         """
         Log a single message to the session.
@@ -115,39 +234,46 @@ class CLILogger:
             content: Message content
             tokens: Optional token count
             metadata: Optional metadata dict (stored as JSON)
+            commit: Commit immediately; if False the message is left in the
+                open transaction for a later group commit
 
         Returns:
             message_id: ID of inserted message
         """
-        # Get next step number
-        cursor = self.conn.execute(
-            """
-            SELECT COALESCE(MAX(step), 0) + 1 AS next_step
-            FROM messages
-            WHERE session_id = ?
-            """,
-            (session_id,)
-        )
-        next_step = cursor.fetchone()['next_step']
+        # Cached steps are only trusted while our write transaction is open:
+        # once it ends, another connection may log to the same session
+        if not self.conn.in_transaction:
+            self._step_cache.clear()
+        last_step = self._step_cache.get(session_id)
 
         # Serialize metadata to JSON if provided
         metadata_json = json.dumps(metadata) if metadata else None
 
-        # Insert message
-        cursor = self.conn.execute(
+        # Insert message; on a cache miss the step is read by the INSERT
+        # itself, under the write lock, so concurrent writers can't reuse it
+        row = self.conn.execute(
             """
             INSERT INTO messages (session_id, role, content, step, tokens, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, COALESCE(?, (
+                SELECT COALESCE(MAX(step), 0) FROM messages WHERE session_id = ?
+            )) + 1, ?, ?)
+            RETURNING id, step
             """,
-            (session_id, role, content, next_step, tokens, metadata_json)
-        )
-        self.conn.commit()
-        message_id = cursor.lastrowid
+            (session_id, role, content, last_step, session_id, tokens, metadata_json)
+        ).fetchone()
+        message_id, next_step = row['id'], row['step']
+        if commit:
+            self.conn.commit()
+        else:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending += 1
+            self._step_cache[session_id] = next_step
 
         # Pretty print
         role_emoji = {"user": "👤", "assistant": "🤖", "system": "⚙️"}
         emoji = role_emoji.get(role, "💬")
-        print(f"{emoji} [{role}] Message {message_id} logged (step {next_step})")
+        self._log(f"{emoji} [{role}] Message {message_id} logged (step {next_step})")
 
         return message_id
 
@@ -176,6 +302,7 @@ class CLILogger:
             (notes, total_tokens, session_id)
         )
         self.conn.commit()
+        self._step_cache.pop(session_id, None)
 
         # Show summary
         session = self.conn.execute(
@@ -185,10 +312,9 @@ class CLILogger:
                 s.started_at,
                 s.finished_at,
                 s.notes,
-                t.title AS topic_title,
+                s.topic_id,
                 COUNT(m.id) AS message_count
             FROM sessions s
-            LEFT JOIN topics t ON t.id = s.topic_id
             LEFT JOIN messages m ON m.session_id = s.id
             WHERE s.id = ?
             GROUP BY s.id
@@ -196,13 +322,14 @@ class CLILogger:
             (session_id,)
         ).fetchone()
 
-        print(f"\n✓ Session {session_id} ended")
-        print(f"  Duration: {session['started_at']} → {session['finished_at']}")
-        print(f"  Messages: {session['message_count']}")
-        if session['topic_title']:
-            print(f"  Topic: {session['topic_title']}")
+        self._log(f"\n✓ Session {session_id} ended")
+        self._log(f"  Duration: {session['started_at']} → {session['finished_at']}")
+        self._log(f"  Messages: {session['message_count']}")
+        topic_title = self._topic_title(session['topic_id']) if session['topic_id'] else None
+        if topic_title:
+            self._log(f"  Topic: {topic_title}")
         if session['notes']:
-            print(f"  Notes: {session['notes']}")
+            self._log(f"  Notes: {session['notes']}")
 
     def interactive_session(self, topic_id: Optional[int] = None) -> None:
         """
@@ -230,46 +357,58 @@ class CLILogger:
 
         step_counter = 0
 
-        while True:
-            try:
-                # Alternate between user and assistant
-                role = "user" if step_counter % 2 == 0 else "assistant"
-                prompt = "👤 You: " if role == "user" else "🤖 AI: "
-
-                user_input = input(prompt).strip()
-
-                # Handle commands
-                if user_input.startswith("/end"):
-                    notes = user_input[5:].strip() if len(user_input) > 5 else None
-                    self.end_session(session_id, notes=notes)
-                    print("✓ Session ended. Exiting.")
+        # Replayed/piped input is group-committed. At a terminal every
+        # message is committed before prompting again, so no write lock
+        # is held while waiting for the user.
+        group_commit = not sys.stdin.isatty()
+
+        try:
+            while True:
+                try:
+                    # Alternate between user and assistant
+                    role = "user" if step_counter % 2 == 0 else "assistant"
+                    prompt = "👤 You: " if role == "user" else "🤖 AI: "
+
+                    self._flush_log()
+                    user_input = input(prompt).strip()
+
+                    # Handle commands
+                    if user_input.startswith("/end"):
+                        notes = user_input[5:].strip() if len(user_input) > 5 else None
+                        self.end_session(session_id, notes=notes)
+                        self._flush_log()
+                        print("✓ Session ended. Exiting.")
+                        break
+
+                    elif user_input.startswith("/note"):
+                        note_text = user_input[6:].strip()
+                        self.conn.execute(
+                            "UPDATE sessions SET notes = ? WHERE id = ?",
+                            (note_text, session_id)
+                        )
+                        self.conn.commit()
+                        print(f"✓ Note added: {note_text}")
+                        continue
+
+                    elif user_input == "/quit":
+                        print("⚠ Session not ended. Use /end to finish session.")
+                        break
+
+                    # Log message
+                    if user_input:
+                        self.log_message(session_id, role, user_input, commit=not group_commit)
+                        self._commit_pending()
+                        step_counter += 1
+
+                except KeyboardInterrupt:
+                    print("\n⚠ Interrupted. Session not ended.")
                     break
-
-                elif user_input.startswith("/note"):
-                    note_text = user_input[6:].strip()
-                    self.conn.execute(
-                        "UPDATE sessions SET notes = ? WHERE id = ?",
-                        (note_text, session_id)
-                    )
-                    self.conn.commit()
-                    print(f"✓ Note added: {note_text}")
-                    continue
-
-                elif user_input == "/quit":
-                    print("⚠ Session not ended. Use /end to finish session.")
+                except EOFError:
+                    print("\n⚠ EOF received. Session not ended.")
                     break
-
-                # Log message
-                if user_input:
-                    self.log_message(session_id, role, user_input)
-                    step_counter += 1
-
-            except KeyboardInterrupt:
-                print("\n⚠ Interrupted. Session not ended.")
-                break
-            except EOFError:
-                print("\n⚠ EOF received. Session not ended.")
-                break
+        finally:
+            # Commit anything still batched, however the loop exited
+            self._commit_pending(force=True)
 
     def list_active_sessions(self) -> None:
         """List all active (unfinished) sessions."""
@@ -305,6 +444,44 @@ class CLILogger:
             print()
 
 
+def _default_socket_path(db_path: str) -> str:
+    """Daemon socket path for a database (next to the database file)."""
+    return os.path.abspath(db_path) + '.logger.sock'
+
+
+def serve_daemon(db_path: str, socket_path: str) -> None:
+    """
+    Serve logger commands over a Unix socket until interrupted.
+
+    The connection and CLILogger state (e.g. cached message steps) live
+    for the whole run, so each command costs only its own SQL. Requests
+    are {"cmd": ..., **method_kwargs} (see socket_daemon for the protocol).
+
+    Args:
+        db_path: Path to SQLite database file
+        socket_path: Unix socket to listen on
+    """
+    with CLILogger(db_path) as logger:
+        commands = {
+            'start': logger.start_session,
+            'log': logger.log_message,
+            'end': logger.end_session,
+            'list': logger.list_active_sessions,
+        }
+
+        def handle(request):
+            try:
+                return commands[request.pop('cmd')](**request)
+            except Exception:
+                if logger.conn.in_transaction:
+                    logger.conn.rollback()
+                raise
+            finally:
+                logger._flush_log()  # into the reply's captured output
+
+        socket_daemon.serve(socket_path, handle, name="Logger daemon")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -323,6 +500,9 @@ Examples:
 
   # List active sessions
   python cli_logger.py list
+
+  # Serve commands from one long-running process
+  python cli_logger.py daemon
         """
     )
 
@@ -331,6 +511,10 @@ Examples:
         default='sqlite_knowledge.db',
         help='Path to SQLite database (default: sqlite_knowledge.db)'
     )
+    parser.add_argument(
+        '--socket',
+        help='Logger daemon socket (default: <db>.logger.sock)'
+    )
 
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
@@ -365,12 +549,52 @@ Examples:
     # list command
     subparsers.add_parser('list', help='List active sessions')
 
+    # daemon command
+    subparsers.add_parser('daemon', help='Serve commands over a Unix socket')
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
+    socket_path = args.socket or _default_socket_path(args.db)
+
+    if args.command == 'daemon':
+        serve_daemon(args.db, socket_path)
+        return
+
+    # Forward to a running daemon if there is one
+    request = None
+    if args.command == 'start':
+        request = {'cmd': 'start', 'topic_id': args.topic_id, 'model': args.model, 'notes': args.notes}
+    elif args.command in ('log-user', 'log-assistant'):
+        request = {
+            'cmd': 'log',
+            'session_id': args.session_id,
+            'role': 'user' if args.command == 'log-user' else 'assistant',
+            'content': args.content,
+            'tokens': args.tokens
+        }
+    elif args.command == 'end':
+        request = {
+            'cmd': 'end',
+            'session_id': args.session_id,
+            'notes': args.notes,
+            'total_tokens': args.total_tokens
+        }
+    elif args.command == 'list':
+        request = {'cmd': 'list'}
+
+    if request is not None:
+        reply = socket_daemon.send(socket_path, request)
+        if reply is not None:
+            sys.stdout.write(reply['output'])
+            if not reply['ok']:
+                print(f"Error: {reply['error']}", file=sys.stderr)
+                sys.exit(1)
+            return
+
     # Execute command
     with CLILogger(args.db) as logger:
         if args.command == 'start':
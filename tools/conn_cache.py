@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# tools/conn_cache.py
+# SQLite connection cache shared by the CLI tools
+#
+# Opening a connection and running its PRAGMAs costs more than most of the
+# queries the tools issue, so each process keeps one open connection per
+# database and PRAGMA script:
+# - get_cached_conn(): return the shared connection, opening it on first use
+#
+# Cached connections are closed at interpreter exit.
+
+import atexit
+import os
+import sqlite3
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Open connections by (absolute database path, PRAGMA script), shared by
+# the tools running in one process
+_CONN_CACHE: Dict[Tuple[str, str], sqlite3.Connection] = {}
+
+
+def get_cached_conn(
+    db_path: str,
+    pragmas: str,
+    cached_statements: int = 128,
+    row_factory: Optional[Callable] = None,
+    on_open: Optional[Callable[[sqlite3.Connection], None]] = None
+) -> sqlite3.Connection:
+    """
+    Return the shared connection for db_path, opening and tuning it on first use.
+
+    Callers with different PRAGMA scripts get separate connections to the
+    same database; the same path and script always reuse one.
+
+    Args:
+        db_path: Path to SQLite database
+        pragmas: PRAGMA statements run once when the connection opens
+        cached_statements: Prepared statement cache size
+        row_factory: Row factory of the new connection
+        on_open: Called with the new connection after the PRAGMAs
+
+    Returns:
+        Open connection (closed at interpreter exit)
+    """
+    key = (os.path.abspath(db_path), pragmas)
+    conn = _CONN_CACHE.get(key)
+    if conn is None:
+        conn = sqlite3.connect(db_path, cached_statements=cached_statements)
+        conn.row_factory = row_factory
+        conn.executescript(pragmas)
+        if on_open:
+            on_open(conn)
+        _CONN_CACHE[key] = conn
+    return conn
+
+
+@atexit.register
+def _close_cached_conns():
+    """Close all connections opened by get_cached_conn."""
+    while _CONN_CACHE:
+        _, conn = _CONN_CACHE.popitem()
+        conn.close()
@@ -25,8 +25,14 @@ Usage:
     python import_docs.py from-file docs/fts5.md \\
         --module FTS5 --title "FTS5 Guide" --doc-type note
 
-    # Import entire SQLite doc section
+    # Import entire SQLite doc section(s)
     python import_docs.py sqlite-docs --section pragma
+    python import_docs.py sqlite-docs --section pragma lang fts5 --workers 4
+
+Optional dependencies:
+    selectolax - fast C HTML parser (falls back to stdlib html.parser)
+    httpx - pooled keep-alive HTTP client, HTTP/2 with h2 installed
+            (falls back to urllib, one connection per fetch)
 
 Author: Claude (AI System Architect)
 Created: 2025-11-22
@@ -35,68 +41,310 @@ Version: 1.0.0
 
 import sqlite3
 import argparse
+import atexit
 import sys
 import re
-from typing import Optional, List, Dict, Tuple
+import io
+import codecs
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, List, Dict, Tuple, Union
 from pathlib import Path
 import urllib.request
 import urllib.parse
 from html.parser import HTMLParser
 import json
 
+from chunk_splitter import ChunkSplitter, ensure_chunk_dedup_index
+from conn_cache import get_cached_conn
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:  # optional - fall back to stdlib HTMLToText
+    FastHTMLParser = None
+
+try:
+    import httpx
+except ImportError:  # optional - fall back to urllib
+    httpx = None
+
+
+# Official SQLite docs: section -> (url, module, title)
+_SQLITE_DOCS = {
+    'pragma': ('https://sqlite.org/pragma.html', 'PRAGMA', 'PRAGMA Statements'),
+    'lang': ('https://sqlite.org/lang.html', 'SQL', 'SQL Language Reference'),
+    'fts5': ('https://sqlite.org/fts5.html', 'FTS5', 'FTS5 Full-Text Search'),
+    'json1': ('https://sqlite.org/json1.html', 'JSONB', 'JSON Functions'),
+    'wal': ('https://sqlite.org/wal.html', 'WAL', 'Write-Ahead Logging'),
+    'vtab': ('https://sqlite.org/vtab.html', 'VTAB', 'Virtual Tables'),
+    'window': ('https://sqlite.org/windowfunctions.html', 'SQL', 'Window Functions'),
+}
+
+_USER_AGENT = 'Mozilla/5.0 (RAG Documentation Importer)'
+
+# Shared httpx client (created on first fetch); pools keep-alive
+# connections so repeated fetches from one host skip the TLS handshake
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _get_http_client():
+    """Return the shared httpx client, creating it on first use."""
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            options = dict(headers={'User-Agent': _USER_AGENT}, follow_redirects=True)
+            try:
+                _HTTP_CLIENT = httpx.Client(http2=True, **options)
+            except ImportError:  # http2 needs the optional h2 package
+                _HTTP_CLIENT = httpx.Client(**options)
+            atexit.register(_HTTP_CLIENT.close)
+        return _HTTP_CLIENT
+
+
+def _iter_url_bytes(url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+    """
+    Yield the body of a GET request in chunks.
+
+    Args:
+        url: URL to fetch
+        chunk_size: Bytes per chunk
+
+    Yields:
+        Response body chunks
+
+    Raises:
+        httpx.HTTPStatusError / urllib.error.HTTPError on error status
+    """
+    if httpx is not None:
+        with _get_http_client().stream('GET', url) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes(chunk_size)
+        return
+
+    req = urllib.request.Request(url, headers={'User-Agent': _USER_AGENT})
+    with urllib.request.urlopen(req) as response:
+        while chunk := response.read(chunk_size):
+            yield chunk
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Return the shared connection for db_path, opening and tuning it on first use.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        Open connection (closed at interpreter exit)
+    """
+    # Shared, long-lived connection: keep more prepared statements than
+    # the default 128 (executemany prepares the chunk INSERT once).
+    # WAL + synchronous=NORMAL: one sequential append per commit instead
+    # of two fsyncs; large autocheckpoint keeps bulk chunk imports from
+    # checkpointing mid-batch
+    return get_cached_conn(
+        db_path,
+        """
+            PRAGMA foreign_keys = ON;
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -64000;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA wal_autocheckpoint = 10000;
+        """,
+        cached_statements=512,
+        row_factory=sqlite3.Row,
+        on_open=ensure_chunk_dedup_index
+    )
+
+
+def _chunk_metadata_json(chunk: Dict) -> Optional[str]:
+    """Return chunk metadata as a JSON string (None if absent/empty)."""
+    metadata = chunk.get('metadata')
+    if not metadata:
+        return None
+    if isinstance(metadata, str):
+        return metadata
+    return json.dumps(metadata)
+
+
+# Runs of whitespace collapsed to a single space in extracted text
+_WS_RE = re.compile(r'\s+')
+
+# Tags that end a paragraph in the extracted text
+_BLOCK_TAGS = ('p', 'div', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_BLOCK_SELECTOR = ', '.join(_BLOCK_TAGS)
+_BLOCK_MARK = '\x1e'  # ASCII record separator; not expected in page text
+
+# Elements allowed in <head>; any other start tag implicitly closes it
+_HEAD_TAGS = frozenset(('head', 'title', 'meta', 'link', 'base', 'style', 'script', 'noscript', 'template'))
+# Elements whose raw text content is never page text
+_RAW_TEXT_TAGS = frozenset(('script', 'style'))
+
+
+def _pack_chunk_rows(doc_id: int, chunks: List) -> List[Tuple]:
+    """
+    Pack ChunkSplitter chunks straight into chunks-table parameter rows.
+
+    Reads Chunk attributes directly instead of going through to_dict()
+    and per-field dict lookups.
+
+    Args:
+        doc_id: Document ID
+        chunks: chunk_splitter.Chunk objects
+
+    Returns:
+        Rows for DocImporter.import_chunk_rows
+    """
+    return [
+        (doc_id, c.ord, c.heading, c.text, c.token_est, c.kind or 'doc', c.hash,
+         json.dumps(c.metadata) if c.metadata else None)
+        for c in chunks
+    ]
+
 
 class HTMLToText(HTMLParser):
     """Simple HTML to text converter."""
 
     def __init__(self):
         super().__init__()
-        self.text_parts = []
-        self.skip_tags = {'script', 'style', 'head'}
-        self.current_tag = None
+        # Raw text, a ' ' per markup event and _BLOCK_MARK per block end;
+        # whitespace is cleaned up once in get_text
+        self._buf = io.StringIO()
+        # Inside <head>, until </head>, <body>, a body-only tag or stray
+        # text closes it (as browsers do)
+        self._in_head = False
+        # Open <script>/<style> (or <title> in head) whose text is dropped;
+        # HTMLParser delivers script/style content as one raw data block
+        self._text_tag = None
 
     def handle_starttag(self, tag, attrs):
-        self.current_tag = tag
+        self._buf.write(' ')
+        if tag == 'head':
+            self._in_head = True
+        elif tag not in _HEAD_TAGS:
+            self._in_head = False
+        if tag in _RAW_TEXT_TAGS or (tag == 'title' and self._in_head):
+            self._text_tag = tag
 
     def handle_endtag(self, tag):
-        if tag in ('p', 'div', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
-            self.text_parts.append('\n\n')
-        self.current_tag = None
+        if tag == self._text_tag:
+            self._text_tag = None
+        elif tag == 'head':
+            self._in_head = False
+        if tag in _BLOCK_TAGS:
+            self._buf.write(_BLOCK_MARK)
+            return
+        self._buf.write(' ')
+
+    def handle_comment(self, data):
+        self._buf.write(' ')
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
 
     def handle_data(self, data):
-        if self.current_tag not in self.skip_tags:
-            # Clean whitespace
-            cleaned = ' '.join(data.split())
-            if cleaned:
-                self.text_parts.append(cleaned + ' ')
+        if self._text_tag:
+            return
+        if self._in_head:
+            if data.isspace():
+                return
+            self._in_head = False  # text outside head elements starts the body
+        self._buf.write(data)
 
     def get_text(self) -> str:
-        return ''.join(self.text_parts).strip()
+        # One whitespace-collapsing regex pass per block; each non-empty
+        # block keeps a trailing space before its paragraph break
+        blocks = (_WS_RE.sub(' ', block).strip() for block in self._buf.getvalue().split(_BLOCK_MARK))
+        return '\n\n'.join(block + ' ' if block else '' for block in blocks).strip()
 
 
 class DocImporter:
     """Handles importing external documentation."""
 
-    def __init__(self, db_path: str = "sqlite_knowledge.db"):
+    # Default-config splitters shared by all imports, by hash algorithm
+    _splitters: Dict[str, ChunkSplitter] = {}
+
+    @classmethod
+    def _get_splitter(cls, hash_algo: str = 'blake2b') -> ChunkSplitter:
+        """Return the shared ChunkSplitter for hash_algo, creating it on first use."""
+        splitter = cls._splitters.get(hash_algo)
+        if splitter is None:
+            splitter = cls._splitters[hash_algo] = ChunkSplitter(hash_algo=hash_algo)
+        return splitter
+
+    def __init__(
+        self,
+        db_path: str = "sqlite_knowledge.db",
+        conn: Optional[sqlite3.Connection] = None,
+        hash_algo: str = 'blake2b',
+        verbose: bool = True
+    ):
         """
         Initialize doc importer.
 
         Args:
             db_path: Path to SQLite database
+            conn: Open connection to use instead of the shared one for
+                db_path (its row_factory is set to sqlite3.Row)
+            hash_algo: Chunk hash algorithm ('blake2b' or 'xxh3')
+            verbose: Print progress messages (written out on exit)
         """
         self.db_path = db_path
+        self._external_conn = conn
+        self.hash_algo = hash_algo
+        self.verbose = verbose
         self.conn = None
+        # Progress lines, written in one go by _flush_log
+        self._out_buffer: List[str] = []
 
     def __enter__(self):
         """Context manager entry."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        if self._external_conn is not None:
+            self.conn = self._external_conn
+            self.conn.row_factory = sqlite3.Row
+            ensure_chunk_dedup_index(self.conn)
+        else:
+            # Shared per database, so importing several sections in one
+            # process opens the file (and its -wal/-shm) only once
+            self.conn = _get_conn(self.db_path)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        if self.conn:
-            self.conn.close()
+        """Context manager exit; the connection stays open for reuse."""
+        if self.conn and self.conn.in_transaction:
+            self.conn.rollback()
+        self.conn = None
+        self._flush_log()
+
+    def _log(self, message: str) -> None:
+        """Queue a progress line for output (dropped unless verbose)."""
+        if self.verbose:
+            self._out_buffer.append(message + '\n')
+
+    def _flush_log(self) -> None:
+        """Write queued progress lines to stdout with a single write."""
+        if self._out_buffer:
+            sys.stdout.write(''.join(self._out_buffer))
+            sys.stdout.flush()
+            self._out_buffer.clear()
+
+    def fetch_bytes(self, url: str) -> bytes:
+        """
+        Fetch raw content from URL, without decoding.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Response body
+        """
+        self._log(f"Fetching {url}...")
+        data = b''.join(_iter_url_bytes(url))
+
+        self._log(f"✓ Fetched {len(data)} bytes")
+        return data
 
     def fetch_url(self, url: str) -> str:
         """
@@ -108,28 +356,69 @@ class DocImporter:
         Returns:
             Response content (text)
         """
-        print(f"Fetching {url}...")
-        req = urllib.request.Request(
-            url,
-            headers={'User-Agent': 'Mozilla/5.0 (RAG Documentation Importer)'}
-        )
+        return self.fetch_bytes(url).decode('utf-8')
+
+    def fetch_and_parse(self, url: str, chunk_size: int = 65536) -> str:
+        """
+        Fetch an HTML page and convert it to plain text while streaming.
 
-        with urllib.request.urlopen(req) as response:
-            content = response.read().decode('utf-8')
+        The response is decoded and fed to the parser chunk by chunk, so
+        the raw HTML is never held in memory as a whole.
 
-        print(f"✓ Fetched {len(content)} bytes")
-        return content
+        Args:
+            url: URL to fetch
+            chunk_size: Bytes read from the response per parser feed
+
+        Returns:
+            Plain text
+        """
+        if FastHTMLParser is not None:
+            # The C parser needs the whole document; it is still far faster.
+            # It takes the bytes directly, skipping a separate decode copy.
+            return self.html_to_text(self.fetch_bytes(url))
+
+        self._log(f"Fetching {url}...")
+        parser = HTMLToText()
+        # Incremental decoder keeps multi-byte characters split across reads intact
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        size = 0
+
+        for chunk in _iter_url_bytes(url, chunk_size):
+            size += len(chunk)
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+
+        self._log(f"✓ Fetched {size} bytes")
+        return parser.get_text()
 
-    def html_to_text(self, html: str) -> str:
+    def html_to_text(self, html: Union[str, bytes]) -> str:
         """
         Convert HTML to plain text.
 
+        Uses selectolax when installed, otherwise the stdlib HTMLToText.
+
         Args:
-            html: HTML content
+            html: HTML content (bytes are taken as UTF-8)
 
         Returns:
             Plain text
         """
+        if FastHTMLParser is not None:
+            tree = FastHTMLParser(html)
+            for node in tree.css('script, style, head'):
+                node.decompose()
+            body = tree.body
+            if body is None:
+                return ''
+            # Mark block ends like HTMLToText does, then collapse whitespace per block
+            for node in body.css(_BLOCK_SELECTOR):
+                node.insert_after(_BLOCK_MARK)
+            blocks = (_WS_RE.sub(' ', b).strip() for b in body.text(separator=' ').split(_BLOCK_MARK))
+            return '\n\n'.join(b for b in blocks if b)
+
+        if isinstance(html, bytes):
+            html = html.decode('utf-8')
         parser = HTMLToText()
         parser.feed(html)
         return parser.get_text()
@@ -177,7 +466,7 @@ class DocImporter:
         doc_id = cursor.fetchone()['id']
         self.conn.commit()
 
-        print(f"✓ Created doc: {title} (id={doc_id})")
+        self._log(f"✓ Created doc: {title} (id={doc_id})")
         return doc_id
 
     def import_chunks(self, doc_id: int, chunks: List[Dict]) -> int:
@@ -191,35 +480,53 @@ class DocImporter:
         Returns:
             Number of chunks imported
         """
-        count = 0
-        for chunk in chunks:
-            metadata_json = None
-            if 'metadata' in chunk and chunk['metadata']:
-                if isinstance(chunk['metadata'], str):
-                    metadata_json = chunk['metadata']
-                else:
-                    metadata_json = json.dumps(chunk['metadata'])
-
-            self.conn.execute(
+        # Chunks without a hash (e.g. hand-written JSON) get one, so the
+        # (doc_id, hash) duplicate guard applies to them too
+        compute_hash = self._get_splitter(self.hash_algo).compute_hash
+        rows = [
+            (
+                doc_id,
+                chunk['ord'],
+                chunk.get('heading'),
+                chunk['text'],
+                chunk.get('token_est'),
+                chunk.get('kind', 'doc'),
+                chunk.get('hash') or compute_hash(chunk['text']),
+                _chunk_metadata_json(chunk)
+            )
+            for chunk in chunks
+        ]
+        return self.import_chunk_rows(rows)
+
+    def import_chunk_rows(self, rows: List[Tuple]) -> int:
+        """
+        Insert pre-packed chunk rows.
+
+        Args:
+            rows: (doc_id, ord, heading, text, token_est, kind, hash,
+                metadata_json) tuples, e.g. from _pack_chunk_rows
+
+        Returns:
+            Number of chunks imported
+        """
+        # One write transaction; executemany prepares the INSERT once
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            cursor = self.conn.executemany(
                 """
                 INSERT INTO chunks (doc_id, ord, heading, text, token_est, kind, hash, metadata)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(doc_id, hash) DO NOTHING
                 """,
-                (
-                    doc_id,
-                    chunk['ord'],
-                    chunk.get('heading'),
-                    chunk['text'],
-                    chunk.get('token_est'),
-                    chunk.get('kind', 'doc'),
-                    chunk.get('hash'),
-                    metadata_json
-                )
+                rows
             )
-            count += 1
+        count = cursor.rowcount  # already-imported chunks are skipped
 
-        self.conn.commit()
-        print(f"✓ Imported {count} chunks")
+        skipped = len(rows) - count
+        if skipped:
+            self._log(f"✓ Imported {count} chunks ({skipped} already present)")
+        else:
+            self._log(f"✓ Imported {count} chunks")
         return count
 
     def import_from_url(
@@ -245,12 +552,30 @@ class DocImporter:
         Returns:
             (doc_id, chunk_count)
         """
-        # Fetch content
-        html = self.fetch_url(url)
+        # Fetch content and convert to text
+        text = self.fetch_and_parse(url)
 
-        # Convert to text
-        text = self.html_to_text(html)
+        # Split into chunks
+        chunks = self._get_splitter(self.hash_algo).split_plaintext(text, kind='doc')
+
+        return self._store_url_doc(url, module, title, doc_type, topic_id, version, chunks)
+
+    def _store_url_doc(
+        self,
+        url: str,
+        module: str,
+        title: str,
+        doc_type: str,
+        topic_id: Optional[int],
+        version: Optional[str],
+        chunks: List
+    ) -> Tuple[int, int]:
+        """
+        Create the doc row for a fetched URL and import its chunks.
 
+        Returns:
+            (doc_id, chunk_count)
+        """
         # Generate slug from URL
         parsed = urllib.parse.urlparse(url)
         slug = Path(parsed.path).stem or 'index'
@@ -267,13 +592,8 @@ class DocImporter:
             version=version
         )
 
-        # Split into chunks (using chunk_splitter logic inline)
-        from chunk_splitter import ChunkSplitter
-        splitter = ChunkSplitter()
-        chunks = splitter.split_plaintext(text, kind='doc')
-
         # Import chunks
-        chunk_count = self.import_chunks(doc_id, [c.to_dict() for c in chunks])
+        chunk_count = self.import_chunk_rows(_pack_chunk_rows(doc_id, chunks))
 
         return doc_id, chunk_count
 
@@ -340,8 +660,7 @@ class DocImporter:
         )
 
         # Split into chunks
-        from chunk_splitter import ChunkSplitter
-        splitter = ChunkSplitter()
+        splitter = self._get_splitter(self.hash_algo)
 
         if file_format == 'markdown':
             chunks = splitter.split_markdown(content)
@@ -349,7 +668,7 @@ class DocImporter:
             chunks = splitter.split_plaintext(content, kind='doc')
 
         # Import chunks
-        chunk_count = self.import_chunks(doc_id, [c.to_dict() for c in chunks])
+        chunk_count = self.import_chunk_rows(_pack_chunk_rows(doc_id, chunks))
 
         return doc_id, chunk_count
 
@@ -368,32 +687,52 @@ class DocImporter:
         Returns:
             List of (doc_id, chunk_count) tuples
         """
-        # SQLite docs URL map
-        docs_urls = {
-            'pragma': ('https://sqlite.org/pragma.html', 'PRAGMA', 'PRAGMA Statements'),
-            'lang': ('https://sqlite.org/lang.html', 'SQL', 'SQL Language Reference'),
-            'fts5': ('https://sqlite.org/fts5.html', 'FTS5', 'FTS5 Full-Text Search'),
-            'json1': ('https://sqlite.org/json1.html', 'JSONB', 'JSON Functions'),
-            'wal': ('https://sqlite.org/wal.html', 'WAL', 'Write-Ahead Logging'),
-            'vtab': ('https://sqlite.org/vtab.html', 'VTAB', 'Virtual Tables'),
-            'window': ('https://sqlite.org/windowfunctions.html', 'SQL', 'Window Functions'),
-        }
-
-        if section not in docs_urls:
-            raise ValueError(f"Unknown section: {section}. Available: {', '.join(docs_urls.keys())}")
-
-        url, module, title = docs_urls[section]
-
-        print(f"\nImporting {section} docs from {url}...")
-        doc_id, chunk_count = self.import_from_url(
-            url=url,
-            module=module,
-            title=title,
-            doc_type='official',
-            version=version
-        )
+        return self.import_sqlite_docs_sections([section], version=version)
 
-        return [(doc_id, chunk_count)]
+    def import_sqlite_docs_sections(
+        self,
+        sections: List[str],
+        version: str = '3.51.0',
+        max_workers: int = 4
+    ) -> List[Tuple[int, int]]:
+        """
+        Import several sections of official SQLite documentation.
+
+        Fetching, HTML conversion and chunking run in a thread pool (the
+        time is mostly network wait); docs and chunks are then written on
+        the calling thread, one section at a time, in the given order.
+
+        Args:
+            sections: Section names ('pragma', 'lang', ...)
+            version: SQLite version
+            max_workers: Concurrent fetches
+
+        Returns:
+            List of (doc_id, chunk_count) tuples, one per section
+        """
+        unknown = [section for section in sections if section not in _SQLITE_DOCS]
+        if unknown:
+            raise ValueError(
+                f"Unknown section: {', '.join(unknown)}. Available: {', '.join(_SQLITE_DOCS)}"
+            )
+
+        splitter = self._get_splitter(self.hash_algo)
+
+        def fetch_and_split(section):
+            url = _SQLITE_DOCS[section][0]
+            self._log(f"\nImporting {section} docs from {url}...")
+            return splitter.split_plaintext(self.fetch_and_parse(url), kind='doc')
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fetch_and_split, section) for section in sections]
+            for section, future in zip(sections, futures):
+                url, module, title = _SQLITE_DOCS[section]
+                results.append(self._store_url_doc(
+                    url, module, title, 'official', None, version, future.result()
+                ))
+
+        return results
 
 
 def main():
@@ -404,6 +743,9 @@ def main():
     )
 
     parser.add_argument('--db', default='sqlite_knowledge.db', help='Database path')
+    parser.add_argument('--hash', default='blake2b', choices=['blake2b', 'xxh3'],
+                        help='Chunk hash algorithm (default: blake2b; xxh3 needs xxhash)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print the final result')
 
     subparsers = parser.add_subparsers(dest='command', help='Command')
 
@@ -431,10 +773,12 @@ def main():
     sqlite_parser.add_argument(
         '--section',
         required=True,
-        choices=['pragma', 'lang', 'fts5', 'json1', 'wal', 'vtab', 'window'],
-        help='Documentation section'
+        nargs='+',
+        choices=list(_SQLITE_DOCS),
+        help='Documentation section(s)'
     )
     sqlite_parser.add_argument('--version', default='3.51.0', help='SQLite version')
+    sqlite_parser.add_argument('--workers', type=int, default=4, help='Concurrent fetches (default: 4)')
 
     args = parser.parse_args()
 
@@ -442,8 +786,8 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    # Execute command
-    with DocImporter(args.db) as importer:
+    # Execute command; progress is flushed on exit, ahead of the summary
+    with DocImporter(args.db, hash_algo=args.hash, verbose=not args.quiet) as importer:
         if args.command == 'from-url':
             doc_id, chunk_count = importer.import_from_url(
                 url=args.url,
@@ -453,7 +797,6 @@ def main():
                 topic_id=args.topic_id,
                 version=args.version
             )
-            print(f"\n✓ Imported doc_id={doc_id} with {chunk_count} chunks")
 
         elif args.command == 'from-file':
             doc_id, chunk_count = importer.import_from_file(
@@ -465,16 +808,19 @@ def main():
                 version=args.version,
                 file_format=args.format
             )
-            print(f"\n✓ Imported doc_id={doc_id} with {chunk_count} chunks")
 
         elif args.command == 'sqlite-docs':
-            results = importer.import_sqlite_docs_section(
-                section=args.section,
-                version=args.version
+            results = importer.import_sqlite_docs_sections(
+                sections=args.section,
+                version=args.version,
+                max_workers=args.workers
             )
-            for doc_id, chunk_count in results:
-                print(f"✓ doc_id={doc_id}, chunks={chunk_count}")
 
+    if args.command == 'sqlite-docs':
+        for doc_id, chunk_count in results:
+            print(f"✓ doc_id={doc_id}, chunks={chunk_count}")
+    else:
+        print(f"\n✓ Imported doc_id={doc_id} with {chunk_count} chunks")
 
 if __name__ == '__main__':
     main()
@@ -7,15 +7,285 @@
 # - extract_jsonb_field(): Extract single field from JSONB
 # - aggregate_jsonb(): Aggregate JSONB fields (AVG, SUM, COUNT)
 # - filter_by_jsonb_array(): Filter rows by JSONB array membership
+# - SQLitePool: bounded connection pool for sharing one helper across threads
+#
+# Optional dependencies:
+# - orjson: faster decoding of extracted JSON (falls back to json)
 #
 # Author: Claude (AI System Architect)
 # Date: 2025-11-22
 # Version: 1.0.0
 
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple, Union
+import collections
+import contextlib
+import functools
+import pathlib
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import json
 
+try:
+    import orjson
+except ImportError:  # optional - fall back to json
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@functools.lru_cache(maxsize=4096)
+def _path(key: str) -> str:
+    """JSON path for a key expression (e.g. 'author' -> '$.author')."""
+    return f'$.{key}'
+
+
+# Keys with expression indexes on jsonb_extract(<col>, '$.<key>') in
+# schema_v2.2_jsonb.sql. Their paths are inlined as SQL literals: the
+# planner only matches an indexed expression written out the same way,
+# never one with a bound ? path.
+HOT_KEYS = {
+    'docs': frozenset({'author', 'priority'}),
+    'sessions': frozenset({'total_tokens', 'user_satisfaction'}),
+    'chunks': frozenset({'source_file', 'language'}),
+}
+
+
+def _key_sql(table: str, key: str) -> str:
+    """SQL for key's path: an index-matching literal for hot keys, else ?."""
+    if key in HOT_KEYS[table]:
+        return f"'{_path(key)}'"
+    return '?'
+
+
+# Identifiers that may be formatted into SQL; anything else is rejected
+_ALLOWED_AGGS = frozenset({'AVG', 'SUM', 'COUNT', 'MIN', 'MAX'})
+_ALLOWED_GROUP_BY = frozenset({'model', 'topic_id', 'imported_to_docs'})  # sessions columns
+_ALLOWED_OPERATORS = ('>', '<', '>=', '<=', '=', '!=')
+_JSONB_COLUMNS = {
+    'docs': 'metadata_jsonb',
+    'sessions': 'telemetry_jsonb',
+    'chunks': 'metadata_jsonb',
+    'messages': 'metadata_jsonb',
+}
+
+
+def _agg_alias(func: str, key: str) -> str:
+    """Quoted '<func>_<key>' result column name (keys may contain '.', '[')."""
+    alias = f"{func.lower()}_{key}".replace('"', '""')
+    return f'"{alias}"'
+
+
+def _check_group_by(group_by: Optional[str]) -> None:
+    """Raise ValueError unless group_by is None or an allowed sessions column."""
+    if group_by is not None and group_by not in _ALLOWED_GROUP_BY:
+        raise ValueError(
+            f"Invalid group_by: {group_by}. Allowed: {', '.join(sorted(_ALLOWED_GROUP_BY))}"
+        )
+
+
+def _field_paths(fields: List[str]) -> List[str]:
+    """
+    JSON paths for a multi-path json_extract() of fields.
+
+    With several paths json_extract() returns a JSON array of the values,
+    but with one path the bare value, so a lone path is repeated.
+    """
+    paths = [_path(field) for field in fields]
+    if len(paths) == 1:
+        paths.append(paths[0])
+    return paths
+
+
+def _json_column(jsonb_col: str, n_paths: int) -> str:
+    """SQL for a JSONB column as text: whole, or json_extract() of n_paths ? paths."""
+    if not n_paths:
+        return f"json({jsonb_col})"
+    return f"json_extract({jsonb_col}, {', '.join('?' * n_paths)})"
+
+
+def _json_value(jsonb_col: str, n_fields: int) -> str:
+    """
+    JSON-text counterpart of _json_column() for json_object() rows: the
+    whole column, or an object of n_fields (? key, ? path) pairs.
+    """
+    if not n_fields:
+        return f"json({jsonb_col})"
+    return f"json_object({', '.join([f'?, json_extract({jsonb_col}, ?)'] * n_fields)})"
+
+
+def _json_value_params(fields: Optional[List[str]]) -> List[str]:
+    """Bound (key, path) pairs for _json_value(jsonb_col, len(fields))."""
+    return [param for field in fields or () for param in (field, _path(field))]
+
+
+def _select_list(columns: List[Tuple[str, str]], return_json: bool) -> str:
+    """
+    SELECT list for (name, expression) columns: one result column each,
+    or with return_json a single json_object() of them per row.
+    """
+    if return_json:
+        pairs = ', '.join(f"'{name}', {expr}" for name, expr in columns)
+        return f"json_object({pairs}) AS row_json"
+    return ', '.join(expr if expr == name else f"{expr} AS {name}" for name, expr in columns)
+
+
+def _session_columns(telemetry_sql: str, return_json: bool = False) -> str:
+    """SELECT list of search_sessions_by_telemetry()."""
+    # jsonb_extract() returns objects as JSONB blobs, which json_object()
+    # rejects; json_extract() returns them as embeddable JSON text
+    extract = 'json_extract' if return_json else 'jsonb_extract'
+    return _select_list([
+        ('id', 'id'),
+        ('topic_id', 'topic_id'),
+        ('model', 'model'),
+        ('started_at', 'started_at'),
+        ('finished_at', 'finished_at'),
+        ('telemetry_field', f'{extract}(telemetry_jsonb, ?)'),
+        ('telemetry', telemetry_sql),
+    ], return_json)
+
+
+_TELEMETRY_SEARCH_TEMPLATE = """
+            SELECT {columns}
+            FROM sessions
+            WHERE telemetry_jsonb IS NOT NULL
+              AND jsonb_extract(telemetry_jsonb, {key_sql}) {operator} ?
+            ORDER BY started_at DESC
+        """
+
+# search_sessions_by_telemetry SQL for non-hot keys, one per allowed operator
+_TELEMETRY_SEARCH_SQL = {
+    operator: _TELEMETRY_SEARCH_TEMPLATE.format(
+        columns=_session_columns(_json_column('telemetry_jsonb', 0)), key_sql='?', operator=operator
+    )
+    for operator in _ALLOWED_OPERATORS
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _namedtuple_row(columns: Tuple[str, ...]) -> type:
+    """namedtuple class for a result's column names, built once per column set."""
+    return collections.namedtuple('Row', columns, rename=True)
+
+
+def _row_maker(columns: Tuple[str, ...], row_type: str) -> Callable[[tuple], Any]:
+    """Function turning a tuple of column values into a row of row_type."""
+    if row_type == 'namedtuple':
+        return _namedtuple_row(columns)._make
+    return lambda values: dict(zip(columns, values))
+
+
+class SQLitePool:
+    """
+    Bounded SQLite connection pool: one read-write connection plus
+    `size` read-only ones, shareable across threads.
+
+    Readers are checked out per query, so concurrent callers don't queue
+    behind a single connection; the writer is serialized with a lock and
+    only opened by the first write(), so a read-only pool works on files
+    it can't write. Every connection gets the cache PRAGMAs once, when
+    opened.
+
+    Usage:
+        pool = SQLitePool('sqlite_knowledge.db', size=8)
+        helper = JSONBQueryHelper(pool)
+        ...
+        pool.close()
+    """
+
+    PRAGMAS = """
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -64000;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA threads = 4;
+    """
+
+    def __init__(self, db_path: str, size: int = 4):
+        """
+        Open the pool's connections.
+
+        Args:
+            db_path: Path to SQLite database
+            size: Number of read-only connections
+        """
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {size}")
+        self.db_path = db_path
+        self.size = size
+
+        # Opened by the first write()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._readers.put(self._connect(read_only=True))
+
+    # Per-connection prepared statement cache (sqlite3 default: 128)
+    CACHED_STATEMENTS = 256
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open one pooled connection with the pool PRAGMAs applied."""
+        if read_only:
+            uri = pathlib.Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(
+                uri, uri=True, check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS
+            )
+        conn.row_factory = sqlite3.Row
+        conn.executescript(self.PRAGMAS)
+        if read_only:
+            # Also refuse writes through SQL (e.g. to a TEMP table)
+            conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection, waiting if all are in use."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the read-write connection exclusively, opening it on first use."""
+        with self._write_lock:
+            if self._writer is None:
+                writer = self._connect(read_only=False)
+                # WAL lets the read-only connections read alongside writes
+                writer.execute("PRAGMA journal_mode = WAL")
+                self._writer = writer
+            yield self._writer
+
+    def close(self) -> None:
+        """Close all connections (waits for checked-out readers)."""
+        for _ in range(self.size):
+            self._readers.get().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class _SingleConnection:
+    """Pool interface over one caller-supplied connection."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def read(self):
+        return contextlib.nullcontext(self.conn)
+
+    write = read
+
 
 class JSONBQueryHelper:
     """
@@ -28,6 +298,14 @@ class JSONBQueryHelper:
         db = sqlite3.connect('sqlite_knowledge.db')
         helper = JSONBQueryHelper(db)
 
+        # Or, shared by several threads: queries run on read-only
+        # pooled connections (pass a path, or a SQLitePool to share)
+        helper = JSONBQueryHelper('sqlite_knowledge.db')
+
+        # Large result sets can be streamed instead of built as a list
+        for chunk in helper.iter_chunks_by_metadata('language', 'python'):
+            ...
+
         # Search by metadata field
         results = helper.search_docs_by_metadata('author', 'Claude')
 
@@ -35,33 +313,240 @@ class JSONBQueryHelper:
         stats = helper.aggregate_session_telemetry('total_tokens', 'AVG')
     """
 
-    def __init__(self, conn: sqlite3.Connection):
-        """Initialize with SQLite connection."""
-        self.conn = conn
-        self.conn.row_factory = sqlite3.Row
+    # Rows fetched per batch by the iter_* methods
+    FETCH_BATCH = 256
+
+    # Applied to a caller-supplied connection (SQLitePool tunes its own).
+    # mmap suits JSONB reads: many small blobs served from the page cache.
+    TUNING_PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -131072",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA threads = 4",
+    )
+
+    def __init__(
+        self,
+        conn: Union[sqlite3.Connection, SQLitePool, str],
+        tune: bool = True,
+        row_type: str = 'dict'
+    ):
+        """
+        Initialize with a SQLite connection, connection pool or database path.
+
+        Args:
+            conn: Connection (used for every query), SQLitePool (a
+                read-only connection is checked out per query), or a
+                database path to open a SQLitePool for (closed by close())
+            tune: Apply TUNING_PRAGMAS (WAL, cache, mmap) to a plain
+                connection; pass False if the caller manages its PRAGMAs
+            row_type: How search/filter/get_active_sessions rows are
+                returned: 'dict', or 'namedtuple' (smaller and faster to
+                build; use ._asdict() where a dict is needed)
+        """
+        if row_type not in ('dict', 'namedtuple'):
+            raise ValueError(f"Invalid row_type: {row_type}")
+        self.row_type = row_type
+        self._owns_pool = False
+        if isinstance(conn, str):
+            self.conn = None
+            self._pool = SQLitePool(conn)
+            self._owns_pool = True
+        elif isinstance(conn, SQLitePool):
+            self.conn = None
+            self._pool = conn
+        else:
+            self.conn = conn
+            self.conn.row_factory = sqlite3.Row
+            self._pool = _SingleConnection(conn)
+            if tune:
+                self._tune(conn)
+        # SQL text by (method, variant...), so each query shape is built
+        # once and repeat calls hit sqlite3's statement cache
+        self._sql_cache: Dict[tuple, str] = {}
+
+    def close(self) -> None:
+        """Close the pool opened for a database path (no-op otherwise)."""
+        if self._owns_pool:
+            self._pool.close()
+            self._owns_pool = False
+
+    def _tune(self, conn: sqlite3.Connection) -> None:
+        """Apply TUNING_PRAGMAS to conn, one statement at a time so an open
+        transaction of the caller's is left alone."""
+        for pragma in self.TUNING_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.OperationalError:
+                pass  # e.g. journal mode/safety level inside a transaction
+
+    def _iter_query(
+        self,
+        sql: str,
+        params: List[Any],
+        fields: Optional[Tuple[str, List[str]]] = None,
+        keyed: bool = False
+    ) -> Iterator[Any]:
+        """
+        Run a read query, yielding rows (per row_type) in fetchmany() batches.
+
+        Args:
+            sql: SELECT statement
+            params: Bound parameters
+            fields: (column, keys): decode that column's json_extract()
+                array into a dict of keys
+            keyed: The first column is a key, not part of the row; yield
+                (key, row) pairs
+        """
+        with self._pool.read() as conn:
+            cursor = conn.execute(sql, params)
+            cursor.row_factory = None  # rows are built from plain tuples below
+            cursor.arraysize = self.FETCH_BATCH
+
+            columns = tuple(column[0] for column in cursor.description)
+            start = 1 if keyed else 0
+            make_row = _row_maker(columns[start:], self.row_type)
+            decode_at = columns.index(fields[0]) if fields else None
+
+            while True:
+                batch = cursor.fetchmany()
+                if not batch:
+                    return
+                for values in batch:
+                    if decode_at is not None:
+                        values = list(values)
+                        values[decode_at] = dict(zip(fields[1], _json_loads(values[decode_at])))
+                    row = make_row(values[start:])
+                    yield (values[0], row) if keyed else row
+
+    def _query_json(self, sql: str, params: List[Any]) -> str:
+        """
+        Run a read query selecting one json_object() per row, returning
+        the rows as a single JSON array text.
+        """
+        with self._pool.read() as conn:
+            cursor = conn.execute(sql, params)
+            cursor.row_factory = None
+            return '[' + ','.join(row[0] for row in cursor) + ']'
 
     # ==========================================================================
     # SEARCH BY METADATA (uses JSONB partial indexes)
     # ==========================================================================
 
+    def _docs_by_metadata_query(
+        self,
+        key: str,
+        value: Any,
+        module: Optional[str],
+        fields: Optional[List[str]],
+        after_id: Optional[int],
+        limit: Optional[int],
+        return_json: bool
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of search_docs_by_metadata()."""
+        key_sql = _key_sql('docs', key)
+        n_fields = len(fields) if fields else 0
+        cache_key = (
+            'search_docs_by_metadata', bool(module), n_fields, key_sql,
+            after_id is not None, limit is not None, return_json
+        )
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            if return_json:
+                metadata = _json_value('metadata_jsonb', n_fields)
+            else:
+                metadata = _json_column('metadata_jsonb', len(_field_paths(fields)) if fields else 0)
+            columns = _select_list([
+                ('id', 'id'),
+                ('module', 'module'),
+                ('slug', 'slug'),
+                ('title', 'title'),
+                ('doc_type', 'doc_type'),
+                ('metadata', metadata),
+            ], return_json)
+            sql = f"""
+                SELECT {columns}
+                FROM docs
+                WHERE metadata_jsonb IS NOT NULL
+                  AND jsonb_extract(metadata_jsonb, {key_sql}) = ?
+            """
+            if module:
+                sql += " AND module = ?"
+            if after_id is not None:
+                # Keyset: rows after the given doc in (created_at, id) order
+                sql += " AND (created_at, id) < (SELECT created_at, id FROM docs WHERE id = ?)"
+            sql += " ORDER BY created_at DESC, id DESC"
+            if limit is not None:
+                sql += " LIMIT ?"
+            self._sql_cache[cache_key] = sql
+
+        if return_json:
+            params: List[Any] = _json_value_params(fields)
+        else:
+            params = _field_paths(fields) if fields else []
+        params += ([_path(key)] if key_sql == '?' else []) + [value]
+        if module:
+            params.append(module)
+        if after_id is not None:
+            params.append(after_id)
+        if limit is not None:
+            params.append(limit)
+        return sql, params
+
+    def iter_docs_by_metadata(
+        self,
+        key: str,
+        value: Any,
+        module: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of search_docs_by_metadata().
+
+        Rows are fetched in batches as the iterator is consumed; with a
+        SQLitePool the connection is held until it is exhausted or closed.
+        """
+        sql, params = self._docs_by_metadata_query(
+            key, value, module, fields, after_id, limit, return_json=False
+        )
+        return self._iter_query(sql, params, fields=('metadata', fields) if fields else None)
+
     def search_docs_by_metadata(
         self,
         key: str,
         value: Any,
-        module: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        module: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        return_json: bool = False
+    ) -> Union[List[Dict[str, Any]], str]:
         """
         Search docs by JSONB metadata field.
 
-        Uses idx_docs_metadata_jsonb partial index.
+        Keys in HOT_KEYS['docs'] use their expression index; for 'author'
+        the index is also in result order, so a page is read without
+        sorting every match.
 
         Args:
             key: JSON key (e.g., 'author', 'priority', 'tags[0]')
             value: Value to match
             module: Optional module filter
+            fields: Metadata keys to return; metadata is then a dict of
+                just these (decoded) instead of the full JSON text
+            after_id: Keyset cursor: id of the last doc of the previous
+                page; only docs after it (newest first) are returned
+            limit: Maximum number of docs (None: all)
+            return_json: Return the docs as JSON array text built by
+                SQLite (metadata embedded as a JSON object), ready to send
 
         Returns:
-            List of matching docs with metadata
+            List of matching docs with metadata, newest first (JSON text
+            with return_json)
 
         Example:
             # Find all docs by author
@@ -73,8 +558,117 @@ class JSONBQueryHelper:
                 10,
                 module='ai-core'
             )
+
+            # Page through an author's docs, 100 at a time
+            page = helper.search_docs_by_metadata('author', 'Claude', limit=100)
+            while page:
+                ...
+                page = helper.search_docs_by_metadata(
+                    'author', 'Claude', after_id=page[-1]['id'], limit=100
+                )
+        """
+        if return_json:
+            return self._query_json(*self._docs_by_metadata_query(
+                key, value, module, fields, after_id, limit, return_json=True
+            ))
+        return list(self.iter_docs_by_metadata(key, value, module, fields, after_id, limit))
+
+    def search_docs_by_metadata_batch(
+        self,
+        pairs: List[Tuple[str, Any]],
+        module: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several search_docs_by_metadata() lookups as one query.
+
+        Args:
+            pairs: (key, value) lookups
+            module: Optional module filter (applies to all pairs)
+
+        Returns:
+            One list of matching docs per pair, in pair order (the same
+            lists search_docs_by_metadata(key, value, module) returns)
+
+        Example:
+            by_claude, urgent = helper.search_docs_by_metadata_batch(
+                [('author', 'Claude'), ('priority', 10)]
+            )
         """
         sql = """
+            WITH p(i, path, value) AS (
+                SELECT key, value ->> 0, value ->> 1 FROM json_each(?)
+            )
+            SELECT
+                p.i AS pair_index,
+                d.id,
+                d.module,
+                d.slug,
+                d.title,
+                d.doc_type,
+                json(d.metadata_jsonb) AS metadata
+            FROM p
+            JOIN docs d
+              ON d.metadata_jsonb IS NOT NULL
+             AND jsonb_extract(d.metadata_jsonb, p.path) = p.value
+        """
+        # Paths and values travel as one JSON array bound to a single ?
+        params: List[Any] = [json.dumps([[_path(key), value] for key, value in pairs])]
+        if module:
+            sql += " WHERE d.module = ?"
+            params.append(module)
+        sql += " ORDER BY p.i, d.created_at DESC"
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in pairs]
+        for pair_index, row in self._iter_query(sql, params, keyed=True):
+            results[pair_index].append(row)
+        return results
+
+    def search_docs_multi(
+        self,
+        predicates: List[Tuple[str, str, Any]],
+        module: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search docs matching all of several JSONB metadata predicates.
+
+        All predicates go into one WHERE clause, so the table is scanned
+        once instead of once per search_docs_by_metadata() call. Keys in
+        HOT_KEYS['docs'] keep their literal paths, so the planner can still
+        pick their expression index for the whole query.
+
+        Note: SQLite decodes the blob once per jsonb_extract() call, i.e.
+        once per predicate per row; AND short-circuits, so put the most
+        selective predicate first.
+
+        Args:
+            predicates: (key, operator, value) triples, operator one of
+                '>', '<', '>=', '<=', '=', '!='
+            module: Optional module filter
+
+        Returns:
+            List of docs matching every predicate, with metadata
+
+        Example:
+            docs = helper.search_docs_multi(
+                [('author', '=', 'Claude'), ('priority', '>', 5)],
+                module='ai-core'
+            )
+        """
+        if not predicates:
+            raise ValueError("At least one predicate is required")
+
+        conditions = []
+        params: List[Any] = []
+        for key, operator, value in predicates:
+            if operator not in _ALLOWED_OPERATORS:
+                raise ValueError(f"Invalid operator: {operator}")
+            key_sql = _key_sql('docs', key)
+            conditions.append(f"jsonb_extract(metadata_jsonb, {key_sql}) {operator} ?")
+            if key_sql == '?':
+                params.append(_path(key))
+            params.append(value)
+
+        sql = f"""
             SELECT
                 id,
                 module,
@@ -84,37 +678,96 @@ class JSONBQueryHelper:
                 json(metadata_jsonb) AS metadata
             FROM docs
             WHERE metadata_jsonb IS NOT NULL
-              AND jsonb_extract(metadata_jsonb, ?) = ?
+              AND {' AND '.join(conditions)}
         """
-        params: List[Any] = [f'$.{key}', value]
-
         if module:
             sql += " AND module = ?"
             params.append(module)
-
         sql += " ORDER BY created_at DESC"
 
-        cursor = self.conn.execute(sql, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return list(self._iter_query(sql, params))
+
+    def _sessions_by_telemetry_query(
+        self,
+        key: str,
+        operator: str,
+        value: Any,
+        fields: Optional[List[str]],
+        return_json: bool
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of search_sessions_by_telemetry()."""
+        if operator not in _ALLOWED_OPERATORS:
+            raise ValueError(f"Invalid operator: {operator}")
+
+        path = _path(key)
+        key_sql = _key_sql('sessions', key)
+        if not fields and key_sql == '?' and not return_json:
+            return _TELEMETRY_SEARCH_SQL[operator], [path, path, value]
+
+        n_fields = len(fields) if fields else 0
+        cache_key = ('search_sessions_by_telemetry', operator, n_fields, key_sql, return_json)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            if return_json:
+                telemetry = _json_value('telemetry_jsonb', n_fields)
+            else:
+                telemetry = _json_column('telemetry_jsonb', len(_field_paths(fields)) if fields else 0)
+            sql = self._sql_cache[cache_key] = _TELEMETRY_SEARCH_TEMPLATE.format(
+                columns=_session_columns(telemetry, return_json),
+                key_sql=key_sql,
+                operator=operator
+            )
+        if return_json:
+            field_params = _json_value_params(fields)
+        else:
+            field_params = _field_paths(fields) if fields else []
+        # Bound in SQL text order: telemetry_field, telemetry, then WHERE
+        params = [path] + field_params + ([path] if key_sql == '?' else []) + [value]
+        return sql, params
+
+    def iter_sessions_by_telemetry(
+        self,
+        key: str,
+        operator: str,
+        value: Any,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of search_sessions_by_telemetry().
+
+        Rows are fetched in batches as the iterator is consumed; with a
+        SQLitePool the connection is held until it is exhausted or closed.
+        """
+        sql, params = self._sessions_by_telemetry_query(
+            key, operator, value, fields, return_json=False
+        )
+        return self._iter_query(sql, params, fields=('telemetry', fields) if fields else None)
 
     def search_sessions_by_telemetry(
         self,
         key: str,
         operator: str,
-        value: Any
-    ) -> List[Dict[str, Any]]:
+        value: Any,
+        fields: Optional[List[str]] = None,
+        return_json: bool = False
+    ) -> Union[List[Dict[str, Any]], str]:
         """
         Search sessions by JSONB telemetry field with operator.
 
-        Uses idx_sessions_telemetry_jsonb partial index.
+        Keys in HOT_KEYS['sessions'] use their expression index.
 
         Args:
             key: Telemetry key (e.g., 'total_tokens', 'user_satisfaction')
             operator: SQL operator ('>', '<', '>=', '<=', '=', '!=')
             value: Value to compare
+            fields: Telemetry keys to return; telemetry is then a dict of
+                just these (decoded) instead of the full JSON text
+            return_json: Return the sessions as JSON array text built by
+                SQLite (telemetry embedded as a JSON object), ready to send
 
         Returns:
-            List of matching sessions with telemetry
+            List of matching sessions with telemetry (JSON text with
+            return_json)
 
         Example:
             # Find sessions with >10k tokens
@@ -127,46 +780,102 @@ class JSONBQueryHelper:
                 'user_satisfaction', '>=', 8
             )
         """
-        allowed_operators = {'>', '<', '>=', '<=', '=', '!='}
-        if operator not in allowed_operators:
-            raise ValueError(f"Invalid operator: {operator}")
+        if return_json:
+            return self._query_json(*self._sessions_by_telemetry_query(
+                key, operator, value, fields, return_json=True
+            ))
+        return list(self.iter_sessions_by_telemetry(key, operator, value, fields))
 
-        sql = f"""
-            SELECT
-                id,
-                topic_id,
-                model,
-                started_at,
-                finished_at,
-                jsonb_extract(telemetry_jsonb, ?) AS telemetry_field,
-                json(telemetry_jsonb) AS telemetry
-            FROM sessions
-            WHERE telemetry_jsonb IS NOT NULL
-              AND jsonb_extract(telemetry_jsonb, ?) {operator} ?
-            ORDER BY started_at DESC
+    def _chunks_by_metadata_query(
+        self,
+        key: str,
+        value: Any,
+        kind: Optional[str],
+        fields: Optional[List[str]],
+        return_json: bool
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of search_chunks_by_metadata()."""
+        key_sql = _key_sql('chunks', key)
+        n_fields = len(fields) if fields else 0
+        cache_key = ('search_chunks_by_metadata', bool(kind), n_fields, key_sql, return_json)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            if return_json:
+                metadata = _json_value('c.metadata_jsonb', n_fields)
+            else:
+                metadata = _json_column('c.metadata_jsonb', len(_field_paths(fields)) if fields else 0)
+            columns = _select_list([
+                ('id', 'c.id'),
+                ('doc_id', 'c.doc_id'),
+                ('heading', 'c.heading'),
+                ('text', 'c.text'),
+                ('kind', 'c.kind'),
+                ('doc_title', 'd.title'),
+                ('module', 'd.module'),
+                ('metadata', metadata),
+            ], return_json)
+            sql = f"""
+                SELECT {columns}
+                FROM chunks c
+                JOIN docs d ON d.id = c.doc_id
+                WHERE c.metadata_jsonb IS NOT NULL
+                  AND jsonb_extract(c.metadata_jsonb, {key_sql}) = ?
+            """
+            if kind:
+                sql += " AND c.kind = ?"
+            sql += " ORDER BY c.doc_id, c.ord"
+            self._sql_cache[cache_key] = sql
+
+        if return_json:
+            params: List[Any] = _json_value_params(fields)
+        else:
+            params = _field_paths(fields) if fields else []
+        params += ([_path(key)] if key_sql == '?' else []) + [value]
+        if kind:
+            params.append(kind)
+        return sql, params
+
+    def iter_chunks_by_metadata(
+        self,
+        key: str,
+        value: Any,
+        kind: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
+        Streaming variant of search_chunks_by_metadata().
 
-        cursor = self.conn.execute(sql, [f'$.{key}', f'$.{key}', value])
-        return [dict(row) for row in cursor.fetchall()]
+        Rows are fetched in batches as the iterator is consumed; with a
+        SQLitePool the connection is held until it is exhausted or closed.
+        """
+        sql, params = self._chunks_by_metadata_query(key, value, kind, fields, return_json=False)
+        return self._iter_query(sql, params, fields=('metadata', fields) if fields else None)
 
     def search_chunks_by_metadata(
         self,
         key: str,
         value: Any,
-        kind: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        kind: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        return_json: bool = False
+    ) -> Union[List[Dict[str, Any]], str]:
         """
         Search chunks by JSONB metadata field.
 
-        Uses idx_chunks_metadata_jsonb partial index.
+        Keys in HOT_KEYS['chunks'] use their expression index.
 
         Args:
             key: Metadata key (e.g., 'source_file', 'language')
             value: Value to match
             kind: Optional kind filter ('doc', 'ai', 'code', etc.)
+            fields: Metadata keys to return; metadata is then a dict of
+                just these (decoded) instead of the full JSON text
+            return_json: Return the chunks as JSON array text built by
+                SQLite (metadata embedded as a JSON object), ready to send
 
         Returns:
-            List of matching chunks with doc info
+            List of matching chunks with doc info (JSON text with
+            return_json)
 
         Example:
             # Find chunks from specific source file
@@ -179,31 +888,11 @@ class JSONBQueryHelper:
                 'language', 'python', kind='code'
             )
         """
-        sql = """
-            SELECT
-                c.id,
-                c.doc_id,
-                c.heading,
-                c.text,
-                c.kind,
-                d.title AS doc_title,
-                d.module,
-                json(c.metadata_jsonb) AS metadata
-            FROM chunks c
-            JOIN docs d ON d.id = c.doc_id
-            WHERE c.metadata_jsonb IS NOT NULL
-              AND jsonb_extract(c.metadata_jsonb, ?) = ?
-        """
-        params: List[Any] = [f'$.{key}', value]
-
-        if kind:
-            sql += " AND c.kind = ?"
-            params.append(kind)
-
-        sql += " ORDER BY c.doc_id, c.ord"
-
-        cursor = self.conn.execute(sql, params)
-        return [dict(row) for row in cursor.fetchall()]
+        if return_json:
+            return self._query_json(*self._chunks_by_metadata_query(
+                key, value, kind, fields, return_json=True
+            ))
+        return list(self.iter_chunks_by_metadata(key, value, kind, fields))
 
     # ==========================================================================
     # EXTRACT JSONB FIELDS
@@ -217,6 +906,8 @@ class JSONBQueryHelper:
         """
         Extract single field from session telemetry JSONB.
 
+        For several fields, extract_session_fields() reads them in one pass.
+
         Args:
             session_id: Session ID
             key: Telemetry key path (e.g., 'total_tokens', 'tools[0].name')
@@ -228,15 +919,64 @@ class JSONBQueryHelper:
             tokens = helper.extract_session_field(1, 'total_tokens')
             # Returns: 15234
         """
-        cursor = self.conn.execute(
+        with self._pool.read() as conn:
+            row = conn.execute(
+                """
+                SELECT jsonb_extract(telemetry_jsonb, ?) AS field
+                FROM sessions
+                WHERE id = ? AND telemetry_jsonb IS NOT NULL
+                """,
+                [_path(key), session_id]
+            ).fetchone()
+        return row['field'] if row else None
+
+    def extract_session_scalar(
+        self,
+        session_id: int,
+        key: str,
+        *,
+        as_int: bool = False,
+        as_float: bool = False,
+        as_text: bool = False
+    ) -> Optional[Any]:
+        """
+        Extract a scalar telemetry field, optionally cast to one type in SQL.
+
+        Uses the ->> operator, which yields a plain SQL value (objects and
+        arrays come back as JSON text, never JSONB bytes), and CASTs it in
+        SQLite so the value arrives already typed.
+
+        Args:
+            session_id: Session ID
+            key: Telemetry key path
+            as_int: Return an int (CAST AS INTEGER)
+            as_float: Return a float (CAST AS REAL)
+            as_text: Return a str (CAST AS TEXT)
+
+        Returns:
+            Extracted value or None
+
+        Example:
+            tokens = helper.extract_session_scalar(1, 'total_tokens', as_int=True)
+            # Returns: 15234
+        """
+        flags = {'INTEGER': as_int, 'REAL': as_float, 'TEXT': as_text}
+        casts = [sql_type for sql_type, flag in flags.items() if flag]
+        if len(casts) > 1:
+            raise ValueError("Pass at most one of as_int, as_float, as_text")
+        cast = casts[0] if casts else None
+
+        cache_key = ('extract_session_scalar', cast)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            field = f"CAST(telemetry_jsonb ->> ? AS {cast})" if cast else "telemetry_jsonb ->> ?"
+            sql = self._sql_cache[cache_key] = f"""
+                SELECT {field} AS field
+                FROM sessions
+                WHERE id = ? AND telemetry_jsonb IS NOT NULL
             """
-            SELECT jsonb_extract(telemetry_jsonb, ?) AS field
-            FROM sessions
-            WHERE id = ? AND telemetry_jsonb IS NOT NULL
-            """,
-            [f'$.{key}', session_id]
-        )
-        row = cursor.fetchone()
+        with self._pool.read() as conn:
+            row = conn.execute(sql, [_path(key), session_id]).fetchone()
         return row['field'] if row else None
 
     def extract_doc_field(
@@ -247,6 +987,8 @@ class JSONBQueryHelper:
         """
         Extract single field from doc metadata JSONB.
 
+        For several fields, extract_doc_fields() reads them in one pass.
+
         Args:
             doc_id: Doc ID
             key: Metadata key path (e.g., 'author', 'tags[0]')
@@ -254,17 +996,151 @@ class JSONBQueryHelper:
         Returns:
             Extracted value or None
         """
-        cursor = self.conn.execute(
-            """
-            SELECT jsonb_extract(metadata_jsonb, ?) AS field
-            FROM docs
-            WHERE id = ? AND metadata_jsonb IS NOT NULL
-            """,
-            [f'$.{key}', doc_id]
-        )
-        row = cursor.fetchone()
+        with self._pool.read() as conn:
+            row = conn.execute(
+                """
+                SELECT jsonb_extract(metadata_jsonb, ?) AS field
+                FROM docs
+                WHERE id = ? AND metadata_jsonb IS NOT NULL
+                """,
+                [_path(key), doc_id]
+            ).fetchone()
         return row['field'] if row else None
 
+    def extract_session_field_bulk(
+        self,
+        session_ids: List[int],
+        key: str
+    ) -> Dict[int, Any]:
+        """
+        Extract one telemetry field from many sessions in a single query.
+
+        Args:
+            session_ids: Session IDs
+            key: Telemetry key path
+
+        Returns:
+            Dict of session_id -> value, as extract_session_field() would
+            return it (sessions without telemetry are left out)
+        """
+        return self._extract_field_bulk('sessions', 'telemetry_jsonb', session_ids, key)
+
+    def extract_doc_field_bulk(
+        self,
+        doc_ids: List[int],
+        key: str
+    ) -> Dict[int, Any]:
+        """
+        Extract one metadata field from many docs in a single query.
+
+        Args:
+            doc_ids: Doc IDs
+            key: Metadata key path
+
+        Returns:
+            Dict of doc_id -> value, as extract_doc_field() would return
+            it (docs without metadata are left out)
+
+        Example:
+            authors = helper.extract_doc_field_bulk([1, 2, 3], 'author')
+            # Returns: {1: 'Claude', 3: 'Bob'}
+        """
+        return self._extract_field_bulk('docs', 'metadata_jsonb', doc_ids, key)
+
+    def _extract_field_bulk(
+        self,
+        table: str,
+        jsonb_col: str,
+        row_ids: List[int],
+        key: str
+    ) -> Dict[int, Any]:
+        """Shared body of extract_session_field_bulk/extract_doc_field_bulk."""
+        cache_key = ('extract_field_bulk', table)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            # The ids are bound as one JSON array, so the statement is the
+            # same (and prepared once) whatever the number of ids
+            sql = self._sql_cache[cache_key] = f"""
+                SELECT id, jsonb_extract({jsonb_col}, ?) AS field
+                FROM {table}
+                WHERE id IN (SELECT value FROM json_each(?))
+                  AND {jsonb_col} IS NOT NULL
+            """
+        with self._pool.read() as conn:
+            cursor = conn.execute(sql, [_path(key), json.dumps(list(row_ids))])
+            return {row[0]: row[1] for row in cursor}
+
+    def extract_session_fields(
+        self,
+        session_id: int,
+        keys: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract several fields from session telemetry JSONB in one query.
+
+        The telemetry is walked once for all keys, instead of once per
+        extract_session_field() call. Objects and arrays are returned
+        decoded (dicts/lists).
+
+        Args:
+            session_id: Session ID
+            keys: Telemetry key paths
+
+        Returns:
+            Dict of key -> value (None where missing), or None if the
+            session has no telemetry
+
+        Example:
+            fields = helper.extract_session_fields(1, ['total_tokens', 'tool_calls'])
+            # Returns: {'total_tokens': 15234, 'tool_calls': ['WebSearch']}
+        """
+        return self._extract_fields('sessions', 'telemetry_jsonb', session_id, keys)
+
+    def extract_doc_fields(
+        self,
+        doc_id: int,
+        keys: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract several fields from doc metadata JSONB in one query.
+
+        Args:
+            doc_id: Doc ID
+            keys: Metadata key paths
+
+        Returns:
+            Dict of key -> value (None where missing), or None if the
+            doc has no metadata
+        """
+        return self._extract_fields('docs', 'metadata_jsonb', doc_id, keys)
+
+    def _extract_fields(
+        self,
+        table: str,
+        jsonb_col: str,
+        row_id: int,
+        keys: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Shared body of extract_session_fields/extract_doc_fields."""
+        if not keys:
+            return {}
+
+        paths = _field_paths(keys)
+        cache_key = ('extract_fields', table, len(paths))
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            sql = self._sql_cache[cache_key] = f"""
+                SELECT {_json_column(jsonb_col, len(paths))} AS fields
+                FROM {table}
+                WHERE id = ? AND {jsonb_col} IS NOT NULL
+            """
+
+        with self._pool.read() as conn:
+            row = conn.execute(sql, paths + [row_id]).fetchone()
+        if not row:
+            return None
+        return dict(zip(keys, _json_loads(row['fields'])))
+
     # ==========================================================================
     # AGGREGATIONS (uses JSONB for 2-3x speedup)
     # ==========================================================================
@@ -273,8 +1149,10 @@ class JSONBQueryHelper:
         self,
         key: str,
         agg_func: str = 'AVG',
-        group_by: Optional[str] = None
-    ) -> Union[float, List[Dict[str, Any]]]:
+        group_by: Optional[str] = None,
+        sort: bool = True,
+        as_dict: bool = False
+    ) -> Union[float, List[Dict[str, Any]], Dict[Any, Any]]:
         """
         Aggregate telemetry field across sessions.
 
@@ -283,10 +1161,15 @@ class JSONBQueryHelper:
         Args:
             key: Telemetry key (e.g., 'total_tokens')
             agg_func: Aggregation function ('AVG', 'SUM', 'COUNT', 'MIN', 'MAX')
-            group_by: Optional grouping column ('model', 'topic_id')
+            group_by: Optional grouping column ('model', 'topic_id',
+                'imported_to_docs')
+            sort: Order groups by the aggregate, largest first
+            as_dict: With group_by, return {group: value} (unordered)
+                instead of a list of dicts
 
         Returns:
-            Single value if no group_by, else list of dicts
+            Single value if no group_by, else list of dicts (or a dict
+            with as_dict)
 
         Example:
             # Average tokens across all sessions
@@ -301,38 +1184,159 @@ class JSONBQueryHelper:
             #   {'model': 'gpt-4', 'avg_total_tokens': 12340},
             #   {'model': 'claude-3', 'avg_total_tokens': 8765}
             # ]
+
+            helper.aggregate_session_telemetry(
+                'total_tokens', 'AVG', group_by='model', as_dict=True
+            )
+            # Returns: {'gpt-4': 12340, 'claude-3': 8765}
         """
-        allowed_funcs = {'AVG', 'SUM', 'COUNT', 'MIN', 'MAX'}
-        if agg_func.upper() not in allowed_funcs:
+        agg = agg_func.upper()
+        if agg not in _ALLOWED_AGGS:
             raise ValueError(f"Invalid aggregation: {agg_func}")
+        _check_group_by(group_by)
+        if as_dict and not group_by:
+            raise ValueError("as_dict requires group_by")
+
+        # Sorting is pointless for a dict result
+        sort = sort and not as_dict
+        cache_key = ('aggregate_session_telemetry', agg, group_by, key if group_by else None, sort)
+        sql = self._sql_cache.get(cache_key)
 
         if group_by:
-            sql = f"""
-                SELECT
-                    {group_by},
-                    {agg_func.upper()}(jsonb_extract(telemetry_jsonb, ?)) AS {agg_func.lower()}_{key}
-                FROM sessions
-                WHERE telemetry_jsonb IS NOT NULL
-                  AND {group_by} IS NOT NULL
-                GROUP BY {group_by}
-                ORDER BY {agg_func.lower()}_{key} DESC
-            """
-            cursor = self.conn.execute(sql, [f'$.{key}'])
-            return [dict(row) for row in cursor.fetchall()]
+            if sql is None:
+                alias = _agg_alias(agg, key)
+                sql = f"""
+                    SELECT
+                        {group_by},
+                        {agg}(jsonb_extract(telemetry_jsonb, ?)) AS {alias}
+                    FROM sessions
+                    WHERE telemetry_jsonb IS NOT NULL
+                      AND {group_by} IS NOT NULL
+                    GROUP BY {group_by}
+                """
+                if sort:
+                    sql += f" ORDER BY {alias} DESC"
+                self._sql_cache[cache_key] = sql
+            with self._pool.read() as conn:
+                cursor = conn.execute(sql, [_path(key)])
+                if as_dict:
+                    return {row[0]: row[1] for row in cursor}
+                return [dict(row) for row in cursor.fetchall()]
         else:
-            sql = f"""
-                SELECT {agg_func.upper()}(jsonb_extract(telemetry_jsonb, ?)) AS result
-                FROM sessions
-                WHERE telemetry_jsonb IS NOT NULL
-            """
-            cursor = self.conn.execute(sql, [f'$.{key}'])
-            row = cursor.fetchone()
+            if sql is None:
+                sql = self._sql_cache[cache_key] = f"""
+                    SELECT {agg}(jsonb_extract(telemetry_jsonb, ?)) AS result
+                    FROM sessions
+                    WHERE telemetry_jsonb IS NOT NULL
+                """
+            with self._pool.read() as conn:
+                row = conn.execute(sql, [_path(key)]).fetchone()
             return row['result'] if row else 0.0
 
+    def aggregate_session_telemetry_multi(
+        self,
+        key: str,
+        agg_funcs: Tuple[str, ...] = ('AVG', 'MIN', 'MAX', 'COUNT'),
+        group_by: Optional[str] = None
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Compute several aggregates of a telemetry field in one scan.
+
+        Replaces one aggregate_session_telemetry() call (and table scan)
+        per function.
+
+        Args:
+            key: Telemetry key (e.g., 'total_tokens')
+            agg_funcs: Aggregation functions ('AVG', 'SUM', 'COUNT', 'MIN', 'MAX')
+            group_by: Optional grouping column ('model', 'topic_id',
+                'imported_to_docs')
+
+        Returns:
+            Dict of '<func>_<key>' -> value if no group_by, else one such
+            dict per group (plus the group_by column), ordered by group
+
+        Example:
+            helper.aggregate_session_telemetry_multi('total_tokens', ('MIN', 'MAX'))
+            # Returns: {'min_total_tokens': 120, 'max_total_tokens': 48211}
+        """
+        funcs = tuple(func.upper() for func in agg_funcs)
+        invalid = [func for func in funcs if func not in _ALLOWED_AGGS]
+        if invalid or not funcs:
+            raise ValueError(f"Invalid aggregation: {', '.join(invalid) or '(none)'}")
+        _check_group_by(group_by)
+
+        cache_key = ('aggregate_session_telemetry_multi', funcs, group_by, key)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            # The path is bound once (?1) and shared by every aggregate
+            columns = ', '.join(
+                f'{func}(jsonb_extract(telemetry_jsonb, ?1)) AS {_agg_alias(func, key)}'
+                for func in funcs
+            )
+            if group_by:
+                sql = f"""
+                    SELECT {group_by}, {columns}
+                    FROM sessions
+                    WHERE telemetry_jsonb IS NOT NULL
+                      AND {group_by} IS NOT NULL
+                    GROUP BY {group_by}
+                    ORDER BY {group_by}
+                """
+            else:
+                sql = f"""
+                    SELECT {columns}
+                    FROM sessions
+                    WHERE telemetry_jsonb IS NOT NULL
+                """
+            self._sql_cache[cache_key] = sql
+
+        with self._pool.read() as conn:
+            cursor = conn.execute(sql, [_path(key)])
+            if group_by:
+                return [dict(row) for row in cursor.fetchall()]
+            return dict(cursor.fetchone())
+
     # ==========================================================================
     # ARRAY QUERIES (jsonb_each)
     # ==========================================================================
 
+    def iter_by_jsonb_array(
+        self,
+        table: str,
+        array_path: str,
+        array_value: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of filter_by_jsonb_array().
+
+        Rows are fetched in batches as the iterator is consumed; with a
+        SQLitePool the connection is held until it is exhausted or closed.
+        """
+        jsonb_col = _JSONB_COLUMNS.get(table)
+        if jsonb_col is None:
+            raise ValueError(f"Invalid table: {table}. Allowed: {', '.join(_JSONB_COLUMNS)}")
+
+        cache_key = ('filter_by_jsonb_array', table)
+        sql = self._sql_cache.get(cache_key)
+        if sql is None:
+            # EXISTS stops at the first matching element and needs no
+            # DISTINCT, unlike joining every row to all its elements
+            sql = self._sql_cache[cache_key] = f"""
+                SELECT
+                    t.id,
+                    json(t.{jsonb_col}) AS metadata
+                FROM {table} t
+                WHERE t.{jsonb_col} IS NOT NULL
+                  AND EXISTS (
+                      SELECT 1
+                      FROM json_each(jsonb_extract(t.{jsonb_col}, ?)) arr
+                      WHERE arr.value = ?
+                  )
+                ORDER BY t.id
+            """
+
+        return self._iter_query(sql, [_path(array_path), array_value])
+
     def filter_by_jsonb_array(
         self,
         table: str,
@@ -342,7 +1346,8 @@ class JSONBQueryHelper:
         """
         Filter rows where JSONB array contains a value.
 
-        Uses jsonb_each() to iterate array elements.
+        Uses an EXISTS over json_each() of the array, stopping at the
+        first matching element.
 
         Args:
             table: Table name ('docs', 'sessions', 'chunks', 'messages')
@@ -361,31 +1366,26 @@ class JSONBQueryHelper:
                 'sessions', 'tool_calls', 'WebSearch'
             )
         """
-        jsonb_col = 'telemetry_jsonb' if table == 'sessions' else 'metadata_jsonb'
-
-        sql = f"""
-            SELECT DISTINCT
-                t.id,
-                json(t.{jsonb_col}) AS metadata
-            FROM {table} t,
-                 jsonb_each(jsonb_extract(t.{jsonb_col}, ?)) arr
-            WHERE t.{jsonb_col} IS NOT NULL
-              AND arr.value = ?
-        """
-
-        cursor = self.conn.execute(sql, [f'$.{array_path}', array_value])
-        return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_by_jsonb_array(table, array_path, array_value))
 
     # ==========================================================================
     # ACTIVE SESSIONS (uses idx_sessions_active partial index)
     # ==========================================================================
 
-    def get_active_sessions(self) -> List[Dict[str, Any]]:
+    def get_active_sessions(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
         """
-        Get all active sessions (finished_at IS NULL).
+        Get active sessions (finished_at IS NULL), newest first.
 
         Uses idx_sessions_active partial index.
 
+        Args:
+            limit: Maximum sessions to return (default: all)
+            offset: Sessions to skip, for paging
+
         Returns:
             List of active sessions with telemetry
 
@@ -406,20 +1406,23 @@ class JSONBQueryHelper:
             FROM sessions
             WHERE finished_at IS NULL
             ORDER BY started_at DESC
+            LIMIT ? OFFSET ?
         """
-        cursor = self.conn.execute(sql)
-        return [dict(row) for row in cursor.fetchall()]
+        # LIMIT -1 means no limit
+        return list(self._iter_query(sql, [-1 if limit is None else limit, offset]))
 
     # ==========================================================================
     # VALIDATION
     # ==========================================================================
 
-    def validate_json(self, json_text: str) -> Tuple[bool, Optional[str]]:
+    def validate_json(self, json_text: Union[str, bytes]) -> Tuple[bool, Optional[str]]:
         """
         Validate JSON string before INSERT.
 
+        Parses with orjson when installed (several times faster than json).
+
         Args:
-            json_text: JSON string to validate
+            json_text: JSON text to validate (str, or UTF-8 bytes)
 
         Returns:
             (is_valid, error_message)
@@ -430,11 +1433,32 @@ class JSONBQueryHelper:
                 print(f"Invalid JSON: {error}")
         """
         try:
-            json.loads(json_text)
+            _json_loads(json_text)
             return (True, None)
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # JSONDecodeError, or bad UTF-8 in bytes
             return (False, str(e))
 
+    def validate_json_sql(self, json_text: Union[str, bytes]) -> bool:
+        """
+        Check that text is well-formed JSON using SQLite's json_valid().
+
+        Cheaper than validate_json() when the error message isn't needed:
+        nothing is decoded into Python objects.
+
+        Args:
+            json_text: JSON text to validate (str, or UTF-8 bytes)
+
+        Returns:
+            True if valid
+        """
+        if isinstance(json_text, bytes):
+            try:
+                json_text = json_text.decode('utf-8')
+            except UnicodeDecodeError:
+                return False
+        with self._pool.read() as conn:
+            return bool(conn.execute("SELECT json_valid(?)", (json_text,)).fetchone()[0])
+
 
 # ==============================================================================
 # CLI USAGE EXAMPLES
@@ -451,8 +1475,7 @@ def main():
         sys.exit(1)
 
     db_path = sys.argv[1]
-    conn = sqlite3.connect(db_path)
-    helper = JSONBQueryHelper(conn)
+    helper = JSONBQueryHelper(db_path)
 
     print("=== JSONB Query Helper Demo ===\n")
 
@@ -479,7 +1502,7 @@ def main():
         print(f"   - {doc['module']}/{doc['slug']}: {doc['title']}")
     print()
 
-    conn.close()
+    helper.close()
 
 
 if __name__ == '__main__':
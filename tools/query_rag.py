@@ -16,12 +16,21 @@ Usage:
     # Search with filters
     python query_rag.py search "jsonb" --module JSONB --limit 10
 
-    # Vector search (requires embeddings)
-    python query_rag.py vector "explain transactions" --limit 5
+    # Vector search (requires embeddings; the query embedding is a JSON
+    # array of EMBEDDING_DIM floats, '-' reads it from stdin)
+    embed "explain transactions" | python query_rag.py vector - --limit 5
 
     # Get context for RAG prompt
     python query_rag.py context "How does FTS5 tokenizer work?" --max-tokens 2000
 
+    # Keep one query process running; commands run while it is up are
+    # forwarded to it over a Unix socket, skipping the database warm-up
+    python query_rag.py daemon
+
+Optional dependencies:
+    sqlite-vec - vec0 vector index for hybrid_search (without it the
+                 extension is loaded as "vec0" from the library path)
+
 Author: Claude (AI System Architect)
 Created: 2025-11-22
 Version: 1.0.0
@@ -29,34 +38,244 @@ Version: 1.0.0
 
 import sqlite3
 import argparse
+import functools
+import os
+import struct
 import sys
-from typing import List, Dict, Optional, Tuple
+import threading
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence, Tuple, Union
 import json
 
+from chunk_splitter import ChunkSplitter
+from jsonb_helpers import SQLitePool
+import socket_daemon
+
+try:
+    import sqlite_vec
+except ImportError:  # optional - fall back to load_extension('vec0')
+    sqlite_vec = None
+
+
+# Connection pools shared by all RAGQuery instances, one per database
+_POOLS: Dict[str, SQLitePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(db_path: str) -> SQLitePool:
+    """Shared connection pool for db_path, opened on first use."""
+    key = os.path.abspath(db_path)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = SQLitePool(db_path)
+        return pool
+
+
+# Tokenizer for the truncated tail chunk of build_rag_context (tiktoken if
+# installed, else chunk_splitter's word heuristic); built once per process
+_SPLITTER = ChunkSplitter()
+
+
+@functools.lru_cache(maxsize=8192)
+def _count_tokens(text: str) -> int:
+    """Token count of text, memoized so repeat queries skip re-encoding."""
+    return _SPLITTER.estimate_tokens(text)
+
+
+def _dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """Cursor rows as dicts, built from plain tuples (no sqlite3.Row per row)."""
+    cursor.row_factory = None
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _pack_embedding(embedding: Union[bytes, Sequence[float]]) -> bytes:
+    """Embedding as the packed float32 blob vec0 expects."""
+    if isinstance(embedding, bytes):
+        return embedding
+    return struct.pack(f'{len(embedding)}f', *embedding)
+
+
+# Phase 1 ranks matches carrying only (rowid, rank) and applies the
+# filters; phase 2 joins the wide chunk/doc columns for the top `limit`
+# hits alone. module/topic_id/doc_type are stored in chunks_fts
+# (contentless_unindexed), so only metadata filters need chunks/docs.
+_FTS_SEARCH_TEMPLATE = """
+WITH hits AS (
+    SELECT fts.rowid AS chunk_id, fts.rank
+    FROM chunks_fts fts{filter_join}
+    WHERE chunks_fts MATCH ?
+      {where_clause}
+    ORDER BY fts.rank
+    LIMIT ?
+)
+SELECT
+    c.id AS chunk_id,
+    c.heading,
+    c.text,
+    c.token_est,
+    c.kind,
+    d.id AS doc_id,
+    d.title AS doc_title,
+    d.module,
+    d.doc_type,
+    d.version,
+    d.source,
+
+    -- Extract JSONB metadata fields (NEW!)
+    jsonb_extract(d.metadata_jsonb, '$.priority') AS priority,
+    jsonb_extract(d.metadata_jsonb, '$.author') AS author,
+    jsonb_extract(d.metadata_jsonb, '$.tags') AS tags,
+    jsonb_extract(c.metadata_jsonb, '$.source_file') AS chunk_source_file,
+
+    h.rank
+FROM hits h
+JOIN chunks c ON c.id = h.chunk_id
+JOIN docs d ON d.id = c.doc_id
+ORDER BY h.rank
+"""
+
+# (mask bit, condition) for iter_fts_search's module, topic_id and doc_type
+# filters, in parameter order
+_FTS_FILTERS = (
+    (4, "fts.module = ?"),
+    (2, "fts.topic_id = ?"),
+    (1, "fts.doc_type = ?"),
+)
+
+
+def _fts_search_sql(filters: List[str], join_docs: bool = False) -> str:
+    """
+    FTS search SQL ANDing filters.
+
+    Args:
+        filters: Conditions on chunks_fts fts (or chunks c / docs d)
+        join_docs: Join chunks and docs in phase 1 for c/d conditions
+    """
+    filter_join = ""
+    if join_docs:
+        filter_join = ("\n    JOIN chunks c ON c.id = fts.rowid"
+                       "\n    JOIN docs d ON d.id = c.doc_id")
+    where_clause = "AND " + " AND ".join(filters) if filters else ""
+    return _FTS_SEARCH_TEMPLATE.format(filter_join=filter_join, where_clause=where_clause)
+
+
+# FTS search SQL for each combination of the fixed filters, keyed by mask
+_FTS_SQL_VARIANTS: Dict[int, str] = {
+    mask: _fts_search_sql([c for bit, c in _FTS_FILTERS if mask & bit])
+    for mask in range(8)
+}
+
+
+# build_rag_context: the FTS search ordered by relevance per token (rank is
+# negative: lower is better) with a running token total, cut after the
+# first chunk that overflows the budget (the last parameter)
+_CONTEXT_TEMPLATE = """
+WITH results AS ({search}),
+packed AS (
+    SELECT
+        r.*,
+        COALESCE(r.token_est, 0) AS chunk_tokens,
+        ROW_NUMBER() OVER w AS pos,
+        SUM(COALESCE(r.token_est, 0)) OVER w AS cum_tokens
+    FROM results r
+    WINDOW w AS (
+        ORDER BY r.rank / MAX(COALESCE(r.token_est, 0), 1), r.rank, r.chunk_id
+        ROWS UNBOUNDED PRECEDING
+    )
+)
+SELECT chunk_id, heading, text, doc_title, module, source, chunk_tokens, cum_tokens
+FROM packed
+WHERE cum_tokens - chunk_tokens < ?
+ORDER BY pos
+"""
+
+_CONTEXT_SQL_VARIANTS: Dict[int, str] = {
+    mask: _CONTEXT_TEMPLATE.format(search=sql) for mask, sql in _FTS_SQL_VARIANTS.items()
+}
+
 
 class RAGQuery:
     """Query interface for SQLite RAG knowledge base."""
 
-    def __init__(self, db_path: str = "sqlite_knowledge.db"):
+    # Dimension of the vec_chunks embeddings
+    EMBEDDING_DIM = 384
+    # Reciprocal Rank Fusion constant: score = sum of 1 / (RRF_K + rank)
+    RRF_K = 60
+
+    # build_rag_context: search results considered, characters per token
+    # for truncation, and default prompt reserves (system prompt, answer)
+    CANDIDATES = 50
+    CHARS_PER_TOKEN = 4
+    SYSTEM_TOKENS = 350
+    OUTPUT_TOKENS = 512
+
+    def __init__(self, db_path: str = "sqlite_knowledge.db", pool: Optional[SQLitePool] = None):
         """
         Initialize RAG query interface.
 
+        Connections come from a pool that stays open across RAGQuery
+        instances, so repeat queries reuse warmed connections and their
+        prepared statements instead of reopening the database.
+
         Args:
             db_path: Path to SQLite database
+            pool: Connection pool to use (default: the shared pool for db_path)
         """
         self.db_path = db_path
+        self.pool = pool
         self.conn = None
+        self._checkout = None
 
     def __enter__(self):
-        """Context manager entry."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        """Context manager entry: check out a pooled read-only connection."""
+        if self.pool is None:
+            self.pool = _get_pool(self.db_path)
+        self._checkout = self.pool.read()
+        self.conn = self._checkout.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        if self.conn:
-            self.conn.close()
+        """Context manager exit: return the connection to the pool."""
+        if self._checkout:
+            self._checkout.__exit__(exc_type, exc_val, exc_tb)
+            self._checkout = None
+            self.conn = None
+
+    def iter_fts_search(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        topic_id: Optional[int] = None,
+        doc_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, any]] = None,
+        limit: int = 10
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Streaming variant of fts_search(), yielding sqlite3.Row results.
+
+        Rows support access by column name and position like the dicts
+        fts_search() returns, without building a dict per row.
+        """
+        # Fixed filters select one of the precomposed _FTS_SQL_VARIANTS, so
+        # each combination reuses the same cached prepared statement
+        mask = (bool(module) << 2) | (bool(topic_id) << 1) | bool(doc_type)
+        params = [query]
+        params.extend(v for v in (module, topic_id, doc_type) if v)
+
+        if metadata_filter:
+            # JSONB metadata filters (NEW!): keys are part of the SQL text
+            filters = [c for bit, c in _FTS_FILTERS if mask & bit]
+            for key, value in metadata_filter.items():
+                filters.append(f"jsonb_extract(d.metadata_jsonb, '$.{key}') = ?")
+                params.append(value)
+            sql = _fts_search_sql(filters, join_docs=True)
+        else:
+            sql = _FTS_SQL_VARIANTS[mask]
+
+        params.append(limit)
+
+        return self.conn.execute(sql, params)
 
     def fts_search(
         self,
@@ -88,34 +307,116 @@ class RAGQuery:
                 metadata_filter={'priority': 10}
             )
         """
-        # Build WHERE clause for filters
-        filters = []
-        params = [query]
+        return _dicts(self.iter_fts_search(query, module, topic_id, doc_type, metadata_filter, limit))
+
+    @staticmethod
+    def _load_vec(conn: sqlite3.Connection) -> None:
+        """Load the sqlite-vec extension into conn, unless already loaded."""
+        try:
+            conn.execute("SELECT vec_version()")
+            return
+        except sqlite3.OperationalError:
+            pass
+        try:
+            conn.enable_load_extension(True)
+            try:
+                if sqlite_vec:
+                    sqlite_vec.load(conn)
+                else:
+                    conn.load_extension('vec0')
+            finally:
+                conn.enable_load_extension(False)
+        except (AttributeError, sqlite3.OperationalError) as e:
+            raise RuntimeError(
+                f"sqlite-vec extension not available ({e}); pip install sqlite-vec"
+            ) from e
+
+    def ensure_vec_table(self) -> None:
+        """Create the vec_chunks vector index (rowid = chunks.id) if missing."""
+        with self.pool.write() as conn:
+            self._load_vec(conn)
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS vec_chunks "
+                f"USING vec0(embedding float[{self.EMBEDDING_DIM}])"
+            )
+            conn.commit()
+
+    def add_embeddings(
+        self,
+        embeddings: Iterable[Tuple[int, Union[bytes, Sequence[float]]]]
+    ) -> int:
+        """
+        Store chunk embeddings in vec_chunks, replacing existing ones.
 
-        if module:
-            filters.append("fts.module = ?")
-            params.append(module)
+        Args:
+            embeddings: (chunk_id, embedding) pairs; embeddings are
+                EMBEDDING_DIM floats or an already packed float32 blob
 
-        if topic_id:
-            filters.append("fts.topic_id = ?")
-            params.append(topic_id)
+        Returns:
+            Number of embeddings stored
+        """
+        self.ensure_vec_table()
+        rows = [(chunk_id, _pack_embedding(embedding)) for chunk_id, embedding in embeddings]
+        with self.pool.write() as conn:
+            # vec0 has no upsert: drop old vectors first
+            conn.executemany("DELETE FROM vec_chunks WHERE rowid = ?", [(row[0],) for row in rows])
+            conn.executemany("INSERT INTO vec_chunks(rowid, embedding) VALUES (?, ?)", rows)
+            conn.commit()
+        return len(rows)
+
+    def hybrid_search(
+        self,
+        query: str,
+        embedding: Union[bytes, Sequence[float]],
+        limit: int = 10,
+        candidates: int = 50
+    ) -> List[Dict]:
+        """
+        Hybrid search: FTS5 and vector KNN fused with Reciprocal Rank Fusion.
 
-        if doc_type:
-            filters.append("d.doc_type = ?")
-            params.append(doc_type)
+        Both rankings and the fusion run in one SQL statement. A chunk scores
+        1 / (RRF_K + rank) for each list it appears in, so chunks found by
+        both FTS and vector search rank highest.
 
-        # JSONB metadata filters (NEW!)
-        if metadata_filter:
-            for key, value in metadata_filter.items():
-                filters.append(f"jsonb_extract(d.metadata_jsonb, '$.{key}') = ?")
-                params.append(value)
+        Args:
+            query: Search query (FTS5 syntax supported)
+            embedding: Query embedding (EMBEDDING_DIM floats or packed float32)
+            limit: Maximum results
+            candidates: Hits taken from each of the FTS and vector rankings
 
-        where_clause = ""
-        if filters:
-            where_clause = "AND " + " AND ".join(filters)
+        Returns:
+            List of result dicts with chunk and document info, best first,
+            with the fused `score` and each side's rank (`fts_rank`,
+            `vec_rank`; None if the chunk is missing from that list)
 
-        # Query with JSONB extraction
-        sql = f"""
+        Example:
+            results = rag.hybrid_search("WAL checkpoint", embed("WAL checkpoint"))
+        """
+        self._load_vec(self.conn)
+
+        sql = """
+        WITH fts AS (
+            SELECT rowid, row_number() OVER (ORDER BY rank) AS r
+            FROM chunks_fts
+            WHERE chunks_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ),
+        vec AS (
+            SELECT rowid, row_number() OVER (ORDER BY distance) AS r
+            FROM vec_chunks
+            WHERE embedding MATCH ?
+              AND k = ?
+        ),
+        fused AS (
+            SELECT
+                COALESCE(fts.rowid, vec.rowid) AS chunk_id,
+                fts.r AS fts_rank,
+                vec.r AS vec_rank,
+                COALESCE(1.0 / (? + fts.r), 0) + COALESCE(1.0 / (? + vec.r), 0) AS score
+            FROM fts
+            FULL OUTER JOIN vec ON vec.rowid = fts.rowid
+        )
         SELECT
             c.id AS chunk_id,
             c.heading,
@@ -128,28 +429,81 @@ class RAGQuery:
             d.doc_type,
             d.version,
             d.source,
+            f.fts_rank,
+            f.vec_rank,
+            f.score
+        FROM fused f
+        JOIN chunks c ON c.id = f.chunk_id
+        JOIN docs d ON d.id = c.doc_id
+        ORDER BY f.score DESC
+        LIMIT ?
+        """
 
-            -- Extract JSONB metadata fields (NEW!)
-            jsonb_extract(d.metadata_jsonb, '$.priority') AS priority,
-            jsonb_extract(d.metadata_jsonb, '$.author') AS author,
-            jsonb_extract(d.metadata_jsonb, '$.tags') AS tags,
-            jsonb_extract(c.metadata_jsonb, '$.source_file') AS chunk_source_file,
+        params = [
+            query, candidates,
+            _pack_embedding(embedding), candidates,
+            self.RRF_K, self.RRF_K,
+            limit
+        ]
+        return _dicts(self.conn.execute(sql, params))
 
-            fts.rank
-        FROM chunks_fts fts
-        JOIN chunks c ON c.id = fts.rowid
+    def iter_vector_search(
+        self,
+        embedding: Union[bytes, Sequence[float]],
+        limit: int = 10
+    ) -> Iterator[sqlite3.Row]:
+        """Streaming variant of vector_search(), yielding sqlite3.Row results."""
+        self._load_vec(self.conn)
+
+        # KNN runs inside vec0; only the top `limit` rows are joined
+        sql = """
+        WITH knn AS (
+            SELECT rowid, distance
+            FROM vec_chunks
+            WHERE embedding MATCH ?
+              AND k = ?
+        )
+        SELECT
+            c.id AS chunk_id,
+            c.heading,
+            c.text,
+            c.token_est,
+            c.kind,
+            d.id AS doc_id,
+            d.title AS doc_title,
+            d.module,
+            d.doc_type,
+            d.version,
+            d.source,
+            v.distance
+        FROM knn v
+        JOIN chunks c ON c.id = v.rowid
         JOIN docs d ON d.id = c.doc_id
-        WHERE chunks_fts MATCH ?
-          {where_clause}
-        ORDER BY fts.rank
-        LIMIT ?
+        ORDER BY v.distance
         """
 
-        params.append(limit)
+        return self.conn.execute(sql, (_pack_embedding(embedding), limit))
 
-        results = self.conn.execute(sql, params).fetchall()
+    def vector_search(
+        self,
+        embedding: Union[bytes, Sequence[float]],
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Vector similarity search: KNN over the vec_chunks index.
 
-        return [dict(row) for row in results]
+        Args:
+            embedding: Query embedding (EMBEDDING_DIM floats or packed float32)
+            limit: Maximum results
+
+        Returns:
+            List of result dicts with chunk and document info, nearest
+            first, with the vector `distance`
+
+        Example:
+            results = rag.vector_search(embed("explain transactions"), limit=5)
+        """
+        return _dicts(self.iter_vector_search(embedding, limit=limit))
 
     def get_chunk_context(
         self,
@@ -168,81 +522,100 @@ class RAGQuery:
         Returns:
             List of chunks (before, target, after)
         """
-        # Get target chunk
-        target = self.conn.execute(
-            "SELECT * FROM chunks WHERE id = ?", (chunk_id,)
-        ).fetchone()
-
-        if not target:
-            return []
-
-        doc_id = target['doc_id']
-        ord_target = target['ord']
-
-        # Get context chunks
-        chunks = self.conn.execute(
+        # Target lookup and context range in one statement: the target row
+        # gives (doc_id, ord), the neighbours come off idx_chunks_doc_ord
+        cursor = self.conn.execute(
             """
-            SELECT *
-            FROM chunks
-            WHERE doc_id = ?
-              AND ord BETWEEN ? AND ?
-            ORDER BY ord
+            SELECT c.*
+            FROM chunks target
+            JOIN chunks c
+              ON c.doc_id = target.doc_id
+             AND c.ord BETWEEN target.ord - ? AND target.ord + ?
+            WHERE target.id = ?
+            ORDER BY c.ord
             """,
-            (doc_id, ord_target - context_before, ord_target + context_after)
-        ).fetchall()
+            (context_before, context_after, chunk_id)
+        )
 
-        return [dict(row) for row in chunks]
+        return _dicts(cursor)
 
     def build_rag_context(
         self,
         query: str,
         max_tokens: int = 2000,
-        module: Optional[str] = None
+        module: Optional[str] = None,
+        reserve_tokens: Optional[int] = None
     ) -> Tuple[str, List[Dict]]:
         """
         Build context string for RAG prompt.
 
         Strategy:
-        1. FTS search to get top results
-        2. Accumulate chunks until max_tokens reached
-        3. Return formatted context + metadata
+        1. FTS search to get the top CANDIDATES results
+        2. Pack chunks by relevance per token (FTS rank / token_est), so
+           several short relevant chunks beat one long one; ordering and
+           the running token total are computed in SQL
+        3. Truncate the first chunk that doesn't fit to the remaining
+           budget, counting its tokens (memoized) so the cut never
+           overshoots
+        4. Return formatted context + metadata
 
         Args:
             query: User query
-            max_tokens: Maximum tokens for context
+            max_tokens: Token budget of the whole prompt, not of the
+                context alone: the context gets max_tokens - reserve_tokens
             module: Optional module filter
+            reserve_tokens: Part of max_tokens kept free for the system
+                prompt and the answer (default: SYSTEM_TOKENS + OUTPUT_TOKENS,
+                capped at half of max_tokens so small budgets still get context)
 
         Returns:
             (context_str, source_chunks): Formatted context and source metadata
+
+        Raises:
+            ValueError: If reserve_tokens leaves no context budget
         """
-        # Search
-        results = self.fts_search(query, module=module, limit=20)
+        if reserve_tokens is None:
+            reserve_tokens = min(self.SYSTEM_TOKENS + self.OUTPUT_TOKENS, max_tokens // 2)
+        budget = max_tokens - reserve_tokens
+        if budget <= 0:
+            raise ValueError(
+                f"max_tokens {max_tokens} leaves no room for context after "
+                f"reserving {reserve_tokens} tokens for the system prompt and answer"
+            )
+
+        # Search and pack in one statement: rows arrive in packing order
+        # with the running token total, up to the first one that overflows
+        sql = _CONTEXT_SQL_VARIANTS[bool(module) << 2]
+        params = [query] + ([module] if module else []) + [self.CANDIDATES, budget]
 
-        # Accumulate chunks
         context_parts = []
-        total_tokens = 0
         sources = []
 
-        for result in results:
-            chunk_tokens = result['token_est'] or 0
-
-            if total_tokens + chunk_tokens > max_tokens:
-                break
+        cursor = self.conn.execute(sql, params)
+        cursor.row_factory = None  # unpacked by position below
+
+        for chunk_id, heading, text, doc_title, chunk_module, source, chunk_tokens, cum_tokens in cursor:
+            truncated = cum_tokens > budget
+            if truncated:
+                # Only this tail chunk is tokenized; the others trust token_est
+                remaining = budget - (cum_tokens - chunk_tokens)
+                cut = remaining * self.CHARS_PER_TOKEN
+                chunk_tokens = _count_tokens(text[:cut])
+                while chunk_tokens > remaining and cut > 0:
+                    cut = cut * remaining // chunk_tokens
+                    chunk_tokens = _count_tokens(text[:cut])
+                text = text[:cut] + "...[truncated]"
 
             # Format chunk
-            heading = result['heading'] or "(no heading)"
-            text = result['text']
-            source = f"{result['doc_title']} ({result['module']})"
-
-            context_parts.append(f"## {heading}\n\n{text}\n\n")
-            total_tokens += chunk_tokens
+            context_parts.append(f"## {heading or '(no heading)'}\n\n{text}\n\n")
 
             sources.append({
-                'chunk_id': result['chunk_id'],
-                'doc_title': result['doc_title'],
-                'module': result['module'],
-                'heading': result['heading'],
-                'source': result['source']
+                'chunk_id': chunk_id,
+                'doc_title': doc_title,
+                'module': chunk_module,
+                'heading': heading,
+                'source': source,
+                'truncated': truncated
             })
 
         context_str = "".join(context_parts)
@@ -267,16 +640,8 @@ class RAGQuery:
 
         return [(row['module'], row['doc_count']) for row in results]
 
-    def list_topics(self, status: Optional[str] = None) -> List[Dict]:
-        """
-        List topics with document counts.
-
-        Args:
-            status: Filter by status ('pending', 'in_progress', 'done')
-
-        Returns:
-            List of topic dicts
-        """
+    def iter_topics(self, status: Optional[str] = None) -> Iterator[sqlite3.Row]:
+        """Streaming variant of list_topics(), yielding sqlite3.Row topics."""
         sql = """
         SELECT
             t.id,
@@ -297,67 +662,83 @@ class RAGQuery:
 
         sql += " GROUP BY t.id ORDER BY t.priority, t.created_at"
 
-        results = self.conn.execute(sql, params).fetchall()
-        return [dict(row) for row in results]
+        return self.conn.execute(sql, params)
 
-    def get_doc_stats(self) -> Dict:
+    def list_topics(self, status: Optional[str] = None) -> List[Dict]:
         """
-        Get database statistics.
+        List topics with document counts.
+
+        Args:
+            status: Filter by status ('pending', 'in_progress', 'done')
 
         Returns:
-            Dict with stats (doc count, chunk count, modules, etc.)
+            List of topic dicts
         """
-        stats = {}
-
-        # Doc counts by type
-        doc_counts = self.conn.execute(
-            """
-            SELECT doc_type, COUNT(*) AS count
-            FROM docs
-            GROUP BY doc_type
-            """
-        ).fetchall()
-        stats['doc_counts_by_type'] = {row['doc_type']: row['count'] for row in doc_counts}
-
-        # Total chunks
-        total_chunks = self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
-        stats['total_chunks'] = total_chunks
-
-        # Total tokens (estimated)
-        total_tokens = self.conn.execute(
-            "SELECT SUM(token_est) FROM chunks"
-        ).fetchone()[0] or 0
-        stats['total_tokens_estimated'] = total_tokens
-
-        # Modules
-        module_count = self.conn.execute(
-            "SELECT COUNT(DISTINCT module) FROM docs"
-        ).fetchone()[0]
-        stats['module_count'] = module_count
-
-        # Topics
-        topic_stats = self.conn.execute(
-            """
-            SELECT status, COUNT(*) AS count
-            FROM topics
-            GROUP BY status
-            """
-        ).fetchall()
-        stats['topic_counts_by_status'] = {row['status']: row['count'] for row in topic_stats}
+        return [dict(row) for row in self.iter_topics(status)]
 
-        # Sessions
-        session_count = self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
-        stats['total_sessions'] = session_count
-
-        imported_sessions = self.conn.execute(
-            "SELECT COUNT(*) FROM sessions WHERE imported_to_docs = 1"
-        ).fetchone()[0]
-        stats['imported_sessions'] = imported_sessions
-
-        return stats
+    def get_doc_stats(self) -> Dict:
+        """
+        Get database statistics.
 
+        Counts come from the trigger-maintained stats_cache/stats_group
+        tables (schemas/migrations/add_stats_cache.sql), so no table is
+        scanned; databases without them are counted live. Either way it
+        is one query returning (bucket, key, value) rows.
 
-def print_search_results(results: List[Dict], verbose: bool = False) -> None:
+        Returns:
+            Dict with stats (doc count, chunk count, modules, etc.)
+        """
+        try:
+            rows = self.conn.execute(
+                """
+                SELECT 'total' AS bucket, key, value FROM stats_cache
+                UNION ALL
+                SELECT bucket, key, count FROM stats_group
+                ORDER BY bucket, key
+                """
+            ).fetchall()
+        except sqlite3.OperationalError:  # no stats tables (older database)
+            rows = self.conn.execute(
+                """
+                SELECT 'doc_type' AS bucket, doc_type AS key, COUNT(*) AS value
+                FROM docs GROUP BY doc_type
+                UNION ALL
+                SELECT 'module', module, COUNT(*) FROM docs GROUP BY module
+                UNION ALL
+                SELECT 'topic_status', status, COUNT(*) FROM topics GROUP BY status
+                UNION ALL
+                SELECT 'total', 'total_chunks', COUNT(*) FROM chunks
+                UNION ALL
+                SELECT 'total', 'total_tokens', COALESCE(SUM(token_est), 0) FROM chunks
+                UNION ALL
+                SELECT 'total', 'total_sessions', COUNT(*) FROM sessions
+                UNION ALL
+                SELECT 'total', 'imported_sessions', COUNT(*) FROM sessions
+                WHERE imported_to_docs = 1
+                ORDER BY bucket, key
+                """
+            ).fetchall()
+
+        totals = {}
+        groups = {'doc_type': {}, 'module': {}, 'topic_status': {}}
+        for bucket, key, value in rows:
+            if bucket == 'total':
+                totals[key] = value
+            else:
+                groups[bucket][key] = value
+
+        return {
+            'doc_counts_by_type': groups['doc_type'],
+            'total_chunks': totals['total_chunks'],
+            'total_tokens_estimated': totals['total_tokens'],
+            'module_count': len(groups['module']),
+            'topic_counts_by_status': groups['topic_status'],
+            'total_sessions': totals['total_sessions'],
+            'imported_sessions': totals['imported_sessions'],
+        }
+
+
+def print_search_results(results: Sequence[Union[Dict, sqlite3.Row]], verbose: bool = False) -> None:
     """Pretty print search results."""
     if not results:
         print("No results found.")
@@ -371,7 +752,7 @@ def print_search_results(results: List[Dict], verbose: bool = False) -> None:
         print(f"\n[{i}] {result['doc_title']} > {heading}")
         print(f"    Module: {result['module']} | Type: {result['doc_type']} | Tokens: ~{result['token_est']}")
 
-        if result.get('source'):
+        if result['source']:
             print(f"    Source: {result['source']}")
 
         if verbose:
@@ -380,6 +761,118 @@ def print_search_results(results: List[Dict], verbose: bool = False) -> None:
         print("-" * 80)
 
 
+def run_command(rag: RAGQuery, args: argparse.Namespace) -> None:
+    """
+    Run one CLI command against an open RAGQuery, printing its output.
+
+    Args:
+        rag: Open query interface
+        args: Parsed CLI arguments (args.command selects the command)
+    """
+    if args.command == 'search':
+        results = list(rag.iter_fts_search(
+            query=args.query,
+            module=args.module,
+            topic_id=args.topic_id,
+            doc_type=args.doc_type,
+            limit=args.limit
+        ))
+        print_search_results(results, verbose=args.verbose)
+
+    elif args.command == 'vector':
+        results = list(rag.iter_vector_search(json.loads(args.embedding), limit=args.limit))
+        print_search_results(results, verbose=args.verbose)
+
+    elif args.command == 'context':
+        context_str, sources = rag.build_rag_context(
+            query=args.query,
+            max_tokens=args.max_tokens,
+            module=args.module
+        )
+
+        print("\n" + "=" * 80)
+        print("RAG CONTEXT")
+        print("=" * 80 + "\n")
+        print(context_str)
+        print("\n" + "=" * 80)
+        print(f"Sources: {len(sources)} chunks")
+        print("=" * 80 + "\n")
+
+        for src in sources:
+            print(f"- {src['doc_title']} > {src['heading']} ({src['module']})")
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(context_str)
+            print(f"\n✓ Context saved to {args.output}")
+
+    elif args.command == 'modules':
+        modules = rag.list_modules()
+        print("\nModules:\n")
+        for module, count in modules:
+            print(f"  {module}: {count} docs")
+
+    elif args.command == 'topics':
+        topics = list(rag.iter_topics(status=args.status))
+        print(f"\nTopics ({len(topics)}):\n")
+        for topic in topics:
+            status_emoji = {
+                'pending': '⏳',
+                'in_progress': '🔄',
+                'done': '✅',
+                'error': '❌'
+            }
+            emoji = status_emoji.get(topic['status'], '❓')
+            print(f"{emoji} [{topic['id']}] {topic['title']} ({topic['module']})")
+            print(f"    Status: {topic['status']} | Priority: {topic['priority']} | Docs: {topic['doc_count']}")
+
+    elif args.command == 'stats':
+        stats = rag.get_doc_stats()
+        print("\n" + "=" * 60)
+        print("DATABASE STATISTICS")
+        print("=" * 60 + "\n")
+
+        print("Documents:")
+        for doc_type, count in stats['doc_counts_by_type'].items():
+            print(f"  {doc_type}: {count}")
+
+        print(f"\nChunks: {stats['total_chunks']}")
+        print(f"Estimated Tokens: ~{stats['total_tokens_estimated']:,}")
+        print(f"Modules: {stats['module_count']}")
+
+        print("\nTopics:")
+        for status, count in stats['topic_counts_by_status'].items():
+            print(f"  {status}: {count}")
+
+        print(f"\nSessions: {stats['total_sessions']}")
+        print(f"Imported Sessions: {stats['imported_sessions']}")
+
+
+def _default_socket_path(db_path: str) -> str:
+    """Daemon socket path for a database (next to the database file)."""
+    return os.path.abspath(db_path) + '.query.sock'
+
+
+def serve_daemon(db_path: str, socket_path: str) -> None:
+    """
+    Serve query commands over a Unix socket until interrupted.
+
+    One RAGQuery stays open for the whole run, so each command reuses the
+    warmed connection and its prepared statements instead of paying the
+    interpreter and database start-up. Requests are {"cmd": ...,
+    **cli_options} (see socket_daemon for the protocol).
+
+    Args:
+        db_path: Path to SQLite database file
+        socket_path: Unix socket to listen on
+    """
+    with RAGQuery(db_path) as rag:
+        def handle(request):
+            run_command(rag, argparse.Namespace(command=request.pop('cmd'), **request))
+
+        socket_daemon.serve(socket_path, handle, name="Query daemon")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -388,6 +881,7 @@ def main():
     )
 
     parser.add_argument('--db', default='sqlite_knowledge.db', help='Database path')
+    parser.add_argument('--socket', help='Query daemon socket (default: <db>.query.sock)')
 
     subparsers = parser.add_subparsers(dest='command', help='Command')
 
@@ -400,10 +894,19 @@ def main():
     search_parser.add_argument('--limit', type=int, default=10, help='Max results')
     search_parser.add_argument('--verbose', '-v', action='store_true', help='Show full text')
 
+    # vector command
+    vector_parser = subparsers.add_parser('vector', help='Vector similarity search (sqlite-vec)')
+    vector_parser.add_argument('embedding', help="Query embedding as a JSON array of floats ('-' reads stdin)")
+    vector_parser.add_argument('--limit', type=int, default=10, help='Max results')
+    vector_parser.add_argument('--verbose', '-v', action='store_true', help='Show full text')
+
     # context command
     context_parser = subparsers.add_parser('context', help='Build RAG context for prompt')
     context_parser.add_argument('query', help='User query')
-    context_parser.add_argument('--max-tokens', type=int, default=2000, help='Max context tokens')
+    context_parser.add_argument('--max-tokens', type=int, default=2000,
+                                help='Token budget of the whole prompt; the context gets this minus '
+                                     f'{RAGQuery.SYSTEM_TOKENS + RAGQuery.OUTPUT_TOKENS} (at most half) '
+                                     'reserved for the system prompt and answer (default: 2000)')
     context_parser.add_argument('--module', help='Filter by module')
     context_parser.add_argument('--output', help='Save context to file')
 
@@ -417,87 +920,43 @@ def main():
     # stats command
     subparsers.add_parser('stats', help='Show database statistics')
 
+    # daemon command
+    subparsers.add_parser('daemon', help='Serve commands over a Unix socket')
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    # Execute command
-    with RAGQuery(args.db) as rag:
-        if args.command == 'search':
-            results = rag.fts_search(
-                query=args.query,
-                module=args.module,
-                topic_id=args.topic_id,
-                doc_type=args.doc_type,
-                limit=args.limit
-            )
-            print_search_results(results, verbose=args.verbose)
+    socket_path = args.socket or _default_socket_path(args.db)
 
-        elif args.command == 'context':
-            context_str, sources = rag.build_rag_context(
-                query=args.query,
-                max_tokens=args.max_tokens,
-                module=args.module
-            )
+    if args.command == 'daemon':
+        serve_daemon(args.db, socket_path)
+        return
 
-            print("\n" + "=" * 80)
-            print("RAG CONTEXT")
-            print("=" * 80 + "\n")
-            print(context_str)
-            print("\n" + "=" * 80)
-            print(f"Sources: {len(sources)} chunks")
-            print("=" * 80 + "\n")
-
-            for src in sources:
-                print(f"- {src['doc_title']} > {src['heading']} ({src['module']})")
-
-            if args.output:
-                with open(args.output, 'w') as f:
-                    f.write(context_str)
-                print(f"\n✓ Context saved to {args.output}")
-
-        elif args.command == 'modules':
-            modules = rag.list_modules()
-            print("\nModules:\n")
-            for module, count in modules:
-                print(f"  {module}: {count} docs")
-
-        elif args.command == 'topics':
-            topics = rag.list_topics(status=args.status)
-            print(f"\nTopics ({len(topics)}):\n")
-            for topic in topics:
-                status_emoji = {
-                    'pending': '⏳',
-                    'in_progress': '🔄',
-                    'done': '✅',
-                    'error': '❌'
-                }
-                emoji = status_emoji.get(topic['status'], '❓')
-                print(f"{emoji} [{topic['id']}] {topic['title']} ({topic['module']})")
-                print(f"    Status: {topic['status']} | Priority: {topic['priority']} | Docs: {topic['doc_count']}")
-
-        elif args.command == 'stats':
-            stats = rag.get_doc_stats()
-            print("\n" + "=" * 60)
-            print("DATABASE STATISTICS")
-            print("=" * 60 + "\n")
-
-            print("Documents:")
-            for doc_type, count in stats['doc_counts_by_type'].items():
-                print(f"  {doc_type}: {count}")
-
-            print(f"\nChunks: {stats['total_chunks']}")
-            print(f"Estimated Tokens: ~{stats['total_tokens_estimated']:,}")
-            print(f"Modules: {stats['module_count']}")
-
-            print("\nTopics:")
-            for status, count in stats['topic_counts_by_status'].items():
-                print(f"  {status}: {count}")
-
-            print(f"\nSessions: {stats['total_sessions']}")
-            print(f"Imported Sessions: {stats['imported_sessions']}")
+    if args.command == 'vector' and args.embedding == '-':
+        args.embedding = sys.stdin.read()
+
+    # Forward to a running daemon if there is one
+    options = {k: v for k, v in vars(args).items() if k not in ('db', 'socket', 'command')}
+    if options.get('output'):
+        options['output'] = os.path.abspath(options['output'])  # daemon cwd may differ
+    reply = socket_daemon.send(socket_path, {'cmd': args.command, **options})
+    if reply is not None:
+        sys.stdout.write(reply['output'])
+        if not reply['ok']:
+            print(f"Error: {reply['error']}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Execute command
+    with RAGQuery(args.db) as rag:
+        try:
+            run_command(rag, args)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == '__main__':
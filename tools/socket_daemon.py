@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# tools/socket_daemon.py
+# Unix socket daemon shared by the CLI tools
+#
+# Keeps one tool process (with its open connection and caches) running and
+# serves commands from later CLI invocations, so they skip interpreter and
+# database start-up:
+# - serve(): listen on a Unix socket and dispatch requests to a handler
+# - send(): forward one request to a running daemon (None if there is none)
+#
+# Protocol: one JSON object per line, {"cmd": ..., **arguments}; each gets a
+# one-line reply {"ok": bool, "result"|"error": ..., "output": str} where
+# output is what the command printed. {"cmd": "ping"} is answered by serve()
+# itself.
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+from typing import Any, Callable, Dict, Optional
+
+
+def serve(socket_path: str, handle: Callable[[Dict], Any], name: str = "Daemon") -> None:
+    """
+    Serve requests over a Unix socket until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (removed again on exit)
+        handle: Called with each request dict; its return value is the
+            reply's result and anything it prints the reply's output
+        name: Daemon name for status lines (e.g. "Logger daemon")
+
+    Raises:
+        RuntimeError: If a daemon is already listening on socket_path
+    """
+    if os.path.exists(socket_path):
+        if send(socket_path, {'cmd': 'ping'}) is not None:
+            raise RuntimeError(f"{name} already running on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a previous run
+
+    # Treat SIGTERM like Ctrl+C so the socket file is removed
+    previous_sigterm = signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        print(f"✓ {name} listening on {socket_path} (Ctrl+C to stop)")
+
+        while True:
+            client, _ = server.accept()
+            try:
+                with client, client.makefile('rwb') as stream:
+                    for line in stream:
+                        output = io.StringIO()
+                        try:
+                            request = json.loads(line)
+                            result = None
+                            if request.get('cmd') != 'ping':
+                                with contextlib.redirect_stdout(output):
+                                    result = handle(request)
+                            reply = {'ok': True, 'result': result}
+                        except KeyboardInterrupt:
+                            raise
+                        except BaseException as e:  # incl. SystemExit from a command
+                            reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                        reply['output'] = output.getvalue()
+                        stream.write(json.dumps(reply).encode('utf-8') + b'\n')
+                        stream.flush()
+            except OSError as e:
+                # Ctrl+C/SIGTERM mid-reply can surface as the error of
+                # closing the client's stream: still stop
+                if isinstance(e.__context__, KeyboardInterrupt):
+                    raise e.__context__
+                # Otherwise the client went away mid-request; keep serving
+    except KeyboardInterrupt:
+        print(f"\n✓ {name} stopped")
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        signal.signal(signal.SIGTERM, previous_sigterm)
+
+
+def send(socket_path: str, request: Dict) -> Optional[Dict]:
+    """
+    Send one request to a running daemon.
+
+    Args:
+        socket_path: Daemon socket
+        request: {"cmd": ..., **arguments}
+
+    Returns:
+        Daemon reply, or None if no daemon is listening (or it could not
+        be reached), in which case callers run the command themselves
+    """
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            with sock.makefile('rwb') as stream:
+                stream.write(json.dumps(request).encode('utf-8') + b'\n')
+                stream.flush()
+                line = stream.readline()
+    except OSError:  # refused, stale or missing socket, reset connection
+        return None
+    return json.loads(line) if line else None
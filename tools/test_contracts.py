@@ -29,12 +29,17 @@ Author: Claude (AI System Architect)
 Version: 1.0.0
 """
 
+import contextlib
+import io
 import sqlite3
 import unittest
 import os
 import sys
 import tempfile
 import shutil
+import socket
+import subprocess
+import time
 import json
 from pathlib import Path
 
@@ -42,6 +47,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 
+def _connect_fast(db_path, **kwargs):
+    """Connect to a throwaway test database without journal fsyncs."""
+    conn = sqlite3.connect(db_path, **kwargs)
+    # Durability is irrelevant for tmpdir databases
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("PRAGMA synchronous = OFF")
+    return conn
+
+
 class SchemaContract(unittest.TestCase):
     """Test database schema contracts."""
 
@@ -67,23 +81,29 @@ class SchemaContract(unittest.TestCase):
         with open(schema_file) as f:
             schema_sql = f.read()
 
-        conn = sqlite3.connect(cls.db_path)
+        conn = _connect_fast(cls.db_path)
         conn.executescript(schema_sql)
         conn.close()
 
+        # One connection for the class; each test runs inside a savepoint
+        cls.conn = _connect_fast(cls.db_path, check_same_thread=False)
+        cls.conn.row_factory = sqlite3.Row
+        cls.conn.execute("PRAGMA foreign_keys = ON")  # ignored once a savepoint is open
+
     @classmethod
     def tearDownClass(cls):
         """Clean up test database."""
+        cls.conn.close()
         shutil.rmtree(cls.test_dir)
 
     def setUp(self):
-        """Connect to test database."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        """Start a savepoint, so the test's writes are undone afterwards."""
+        self.conn.execute("SAVEPOINT test")
 
     def tearDown(self):
-        """Close database connection."""
-        self.conn.close()
+        """Roll back the test's writes."""
+        self.conn.execute("ROLLBACK TO test")
+        self.conn.execute("RELEASE test")
 
     def test_required_tables_exist(self):
         """CONTRACT: Core tables must exist."""
@@ -144,20 +164,25 @@ class DataIntegrityContract(unittest.TestCase):
         with open(schema_file) as f:
             schema_sql = f.read()
 
-        conn = sqlite3.connect(cls.db_path)
+        conn = _connect_fast(cls.db_path)
         conn.executescript(schema_sql)
         conn.close()
 
+        # One connection for the class; each test runs inside a savepoint
+        cls.conn = _connect_fast(cls.db_path, check_same_thread=False)
+        cls.conn.execute("PRAGMA foreign_keys = ON")  # ignored once a savepoint is open
+
     @classmethod
     def tearDownClass(cls):
+        cls.conn.close()
         shutil.rmtree(cls.test_dir)
 
     def setUp(self):
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("SAVEPOINT test")
 
     def tearDown(self):
-        self.conn.close()
+        self.conn.execute("ROLLBACK TO test")
+        self.conn.execute("RELEASE test")
 
     def test_fts5_syncs_with_chunks(self):
         """CONTRACT: FTS5 must stay in sync with chunks table."""
@@ -174,8 +199,6 @@ class DataIntegrityContract(unittest.TestCase):
             (doc_id,)
         ).fetchone()[0]
 
-        self.conn.commit()
-
         # Check FTS5 has the chunk
         fts_count = self.conn.execute(
             "SELECT COUNT(*) FROM chunks_fts WHERE rowid = ?", (chunk_id,)
@@ -185,7 +208,6 @@ class DataIntegrityContract(unittest.TestCase):
 
         # Delete chunk
         self.conn.execute("DELETE FROM chunks WHERE id = ?", (chunk_id,))
-        self.conn.commit()
 
         # Check FTS5 removed it
         fts_count_after = self.conn.execute(
@@ -207,11 +229,9 @@ class DataIntegrityContract(unittest.TestCase):
             "VALUES (?, 'user', 'test', 1)",
             (session_id,)
         )
-        self.conn.commit()
 
         # Delete session
         self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-        self.conn.commit()
 
         # Messages should be gone
         msg_count = self.conn.execute(
@@ -239,9 +259,10 @@ class ToolsAPIContract(unittest.TestCase):
         with open(schema_file) as f:
             schema_sql = f.read()
 
-        conn = sqlite3.connect(cls.db_path)
+        conn = _connect_fast(cls.db_path)
         conn.executescript(schema_sql)
         conn.close()
+        cls.schema_sql = schema_sql
 
     @classmethod
     def tearDownClass(cls):
@@ -267,6 +288,32 @@ class ToolsAPIContract(unittest.TestCase):
 
             self.assertIsNotNone(session, "Session should exist in database")
 
+    def test_cli_logger_steps_stay_unique_across_loggers(self):
+        """CONTRACT: Two loggers on one session never reuse a step."""
+        from cli_logger import CLILogger
+
+        other_conn = sqlite3.connect(self.db_path)
+        try:
+            with CLILogger(self.db_path, verbose=False) as first, \
+                    CLILogger(conn=other_conn, verbose=False) as second:
+                session_id = first.start_session(model="test")
+                first.log_message(session_id, 'user', 'one')
+                second.log_message(session_id, 'assistant', 'two')
+                first.log_message(session_id, 'user', 'three', commit=False)
+                first.log_message(session_id, 'assistant', 'four', commit=False)
+                first._commit_pending(force=True)
+                second.log_message(session_id, 'user', 'five')
+                first.log_message(session_id, 'assistant', 'six')
+
+            steps = [row[0] for row in other_conn.execute(
+                "SELECT step FROM messages WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            )]
+        finally:
+            other_conn.close()
+
+        self.assertEqual(steps, [1, 2, 3, 4, 5, 6])
+
     def test_chunk_splitter_returns_chunks(self):
         """CONTRACT: chunk_splitter must return valid chunks."""
         from chunk_splitter import ChunkSplitter
@@ -289,24 +336,70 @@ class ToolsAPIContract(unittest.TestCase):
             self.assertTrue(hasattr(chunk, 'kind'))
             self.assertIsInstance(chunk.ord, int)
 
+    def test_chunk_splitter_dir_keeps_one_output_per_file(self):
+        """CONTRACT: Files sharing a stem must not overwrite each other's chunks."""
+        from chunk_splitter import split_markdown_dir
+
+        input_dir = os.path.join(self.test_dir, 'md_in')
+        output_dir = os.path.join(self.test_dir, 'md_out')
+        os.makedirs(input_dir)
+        for name, body in (('notes.md', 'alpha'), ('notes.markdown', 'beta')):
+            with open(os.path.join(input_dir, name), 'w') as f:
+                f.write(f"## {name}\n\n{body}\n")
+
+        results = split_markdown_dir(input_dir, output_dir, max_workers=1)
+
+        output_paths = [path for path, _ in results]
+        self.assertEqual(len(set(output_paths)), 2)
+        texts = set()
+        for path in output_paths:
+            with open(path) as f:
+                texts.update(chunk['text'] for chunk in json.load(f))
+        self.assertTrue(any('alpha' in t for t in texts))
+        self.assertTrue(any('beta' in t for t in texts))
+
+    def test_import_docs_reimport_inserts_nothing(self):
+        """CONTRACT: Re-importing the same chunks reports 0 inserted rows."""
+        from chunk_splitter import ChunkSplitter
+        from import_docs import DocImporter, _pack_chunk_rows
+
+        with DocImporter(self.db_path, verbose=False) as importer:
+            doc_id = importer.conn.execute(
+                "INSERT INTO docs (module, slug, title, doc_type, source) "
+                "VALUES ('TEST', 'reimport', 'Reimport', 'note', 'test') RETURNING id"
+            ).fetchone()[0]
+            importer.conn.commit()
+            chunks = ChunkSplitter().split_markdown("## One\n\nfirst\n\n## Two\n\nsecond")
+            rows = _pack_chunk_rows(doc_id, chunks)
+            self.assertGreater(len(rows), 0)
+
+            self.assertEqual(importer.import_chunk_rows(rows), len(rows))
+            self.assertEqual(importer.import_chunk_rows(rows), 0)
+
+            count = importer.conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE doc_id = ?", (doc_id,)
+            ).fetchone()[0]
+        self.assertEqual(count, len(rows))
+
     def test_query_rag_search_returns_results(self):
         """CONTRACT: query_rag search must return list of dicts."""
         from query_rag import RAGQuery
 
-        # Add test data
+        # Add test data in one transaction
         conn = sqlite3.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
-
-        doc_id = conn.execute(
-            "INSERT INTO docs (module, slug, title, doc_type, source) "
-            "VALUES ('TEST', 'test', 'Test', 'note', 'test') RETURNING id"
-        ).fetchone()[0]
-
-        conn.execute(
-            "INSERT INTO chunks (doc_id, ord, text) VALUES (?, 0, 'test checkpoint')",
-            (doc_id,)
-        )
-        conn.commit()
+        conn.execute("PRAGMA synchronous = OFF")
+
+        with conn:
+            doc_id = conn.execute(
+                "INSERT INTO docs (module, slug, title, doc_type, source) "
+                "VALUES ('TEST', 'test', 'Test', 'note', 'test') RETURNING id"
+            ).fetchone()[0]
+
+            conn.execute(
+                "INSERT INTO chunks (doc_id, ord, text) VALUES (?, 0, 'test checkpoint')",
+                (doc_id,)
+            )
         conn.close()
 
         # Search
@@ -323,6 +416,313 @@ class ToolsAPIContract(unittest.TestCase):
                 self.assertIn('doc_title', result)
 
 
+    @unittest.skipIf(sqlite3.sqlite_version_info < (3, 45, 0), "JSONB needs SQLite 3.45+")
+    def test_jsonb_helpers_keyset_pages_cover_every_doc_once(self):
+        """CONTRACT: Paging with after_id/limit returns each matching doc exactly once."""
+        from jsonb_helpers import JSONBQueryHelper
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            # Several docs share a created_at, so pages must break ties by id
+            conn.executemany(
+                "INSERT INTO docs (module, slug, title, doc_type, source, created_at, metadata) "
+                "VALUES ('TEST', ?, 'Paged', 'note', 'test', ?, ?)",
+                [(f'paged-{i}', f'2024-01-0{1 + i % 3} 00:00:00',
+                  json.dumps({'author': 'pager' if i % 5 else 'other'}))
+                 for i in range(23)]
+            )
+
+        helper = JSONBQueryHelper(conn)
+        everything = [doc['id'] for doc in helper.search_docs_by_metadata('author', 'pager')]
+        paged = []
+        page = helper.search_docs_by_metadata('author', 'pager', limit=4)
+        while page:
+            self.assertLessEqual(len(page), 4)
+            paged += [doc['id'] for doc in page]
+            page = helper.search_docs_by_metadata(
+                'author', 'pager', after_id=page[-1]['id'], limit=4
+            )
+        conn.close()
+
+        self.assertEqual(len(everything), 18)
+        self.assertEqual(paged, everything)
+
+    def test_query_rag_context_fits_small_budgets(self):
+        """CONTRACT: Small prompt budgets still get context; impossible ones are refused."""
+        from query_rag import RAGQuery, main
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            doc_id = conn.execute(
+                "INSERT INTO docs (module, slug, title, doc_type, source) "
+                "VALUES ('TEST', 'budget', 'Budget', 'note', 'test') RETURNING id"
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chunks (doc_id, ord, text, token_est) VALUES (?, 0, ?, 300)",
+                (doc_id, 'budgetword ' * 300)
+            )
+        conn.close()
+
+        with RAGQuery(self.db_path) as rag:
+            # Default reserve (862 tokens) is scaled down for a 100 token prompt
+            context, sources = rag.build_rag_context("budgetword", max_tokens=100)
+            self.assertEqual(len(sources), 1)
+            self.assertTrue(sources[0]['truncated'])
+            self.assertIn('budgetword', context)
+
+            # An explicit reserve that leaves nothing is an error
+            with self.assertRaises(ValueError):
+                rag.build_rag_context("budgetword", max_tokens=100, reserve_tokens=100)
+
+        # The CLI reports it as a one-line error, not a traceback
+        stderr = io.StringIO()
+        argv = ['query_rag.py', '--db', self.db_path,
+                '--socket', os.path.join(self.test_dir, 'none.sock'),
+                'context', 'budgetword', '--max-tokens', '0']
+        with contextlib.redirect_stderr(stderr), contextlib.redirect_stdout(io.StringIO()):
+            saved_argv, sys.argv = sys.argv, argv
+            try:
+                with self.assertRaises(SystemExit) as exit_:
+                    main()
+            finally:
+                sys.argv = saved_argv
+        self.assertEqual(exit_.exception.code, 1)
+        self.assertTrue(stderr.getvalue().startswith('Error: max_tokens 0 leaves no room'))
+
+    def test_query_rag_stats_match_live_counts(self):
+        """CONTRACT: Cached stats equal a live count after inserts, updates and deletes."""
+        from query_rag import RAGQuery
+
+        db_path = os.path.join(self.test_dir, 'stats.db')
+        conn = _connect_fast(db_path)
+        conn.executescript(self.schema_sql)
+        conn.execute("PRAGMA foreign_keys = ON")
+        with conn:
+            doc_ids = [
+                conn.execute(
+                    "INSERT INTO docs (module, slug, title, doc_type, source) "
+                    "VALUES (?, ?, 'Doc', ?, 'test') RETURNING id",
+                    (module, f'doc-{i}', doc_type)
+                ).fetchone()[0]
+                for i, (module, doc_type) in enumerate(
+                    [('A', 'note'), ('A', 'example'), ('B', 'note'), ('C', 'official')]
+                )
+            ]
+            conn.executemany(
+                "INSERT INTO chunks (doc_id, ord, text, token_est) VALUES (?, ?, ?, ?)",
+                [(doc_id, ord_, f'chunk {doc_id}.{ord_}', 10 * ord_ + 5)
+                 for doc_id in doc_ids for ord_ in range(3)]
+            )
+            topic_ids = [
+                conn.execute(
+                    "INSERT INTO topics (module, title, status) VALUES ('A', 'T', ?) RETURNING id",
+                    (status,)
+                ).fetchone()[0]
+                for status in ('pending', 'pending', 'done')
+            ]
+            session_ids = [
+                conn.execute(
+                    "INSERT INTO sessions (topic_id, imported_to_docs) VALUES (?, ?) RETURNING id",
+                    (topic_id, imported)
+                ).fetchone()[0]
+                for topic_id, imported in zip(topic_ids, (0, 1, 1))
+            ]
+
+            conn.execute("UPDATE docs SET doc_type = 'official', module = 'B' WHERE id = ?", (doc_ids[0],))
+            conn.execute("UPDATE chunks SET token_est = 100 WHERE doc_id = ?", (doc_ids[1],))
+            conn.execute("UPDATE topics SET status = 'in_progress' WHERE id = ?", (topic_ids[0],))
+            conn.execute("UPDATE sessions SET imported_to_docs = 1 WHERE id = ?", (session_ids[0],))
+            conn.execute("DELETE FROM docs WHERE id = ?", (doc_ids[3],))  # cascades to chunks
+            conn.execute("DELETE FROM chunks WHERE doc_id = ? AND ord = 0", (doc_ids[2],))
+            conn.execute("DELETE FROM topics WHERE id = ?", (topic_ids[2],))  # cascades to sessions
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_ids[1],))
+
+        with RAGQuery(db_path) as rag:
+            cached = rag.get_doc_stats()
+
+        # Without the stats tables get_doc_stats counts the base tables
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS stats_cache")
+            conn.execute("DROP TABLE IF EXISTS stats_group")
+        conn.close()
+        with RAGQuery(db_path) as rag:
+            live = rag.get_doc_stats()
+
+        self.assertEqual(cached, live)
+        self.assertEqual(live['total_sessions'], 1)
+        self.assertEqual(live['doc_counts_by_type'], {'example': 1, 'note': 1, 'official': 1})
+
+
+class HTMLToTextContract(unittest.TestCase):
+    """Test HTML text extraction contracts."""
+
+    def _text(self, html):
+        from import_docs import HTMLToText
+
+        parser = HTMLToText()
+        parser.feed(html)
+        parser.close()
+        return parser.get_text()
+
+    def test_head_page_keeps_body_text_only(self):
+        """CONTRACT: Title, style and script text are not page text."""
+        text = self._text(
+            "<html><head><title>Title</title><style>p {}</style></head>"
+            "<body><p>Hello</p><script>var x;</script>world</body></html>"
+        )
+        self.assertEqual(text, "Hello \n\nworld")
+
+    def test_unclosed_head_does_not_hide_body(self):
+        """CONTRACT: A missing </head> must not drop the rest of the page."""
+        self.assertEqual(self._text("<head><title>T</title><p>after head</p>"), "after head")
+        self.assertEqual(self._text("<head></pre> word</b>x&amp;y\n<ul>"), "word x&y")
+
+    def test_stray_style_tag_drops_only_its_own_text(self):
+        """CONTRACT: <style> hides its own content, not the text after it."""
+        self.assertEqual(self._text("a<style>b {}</style>c"), "a c")
+        self.assertEqual(self._text("x</style>y"), "x y")
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix sockets not available")
+class SocketDaemonContract(unittest.TestCase):
+    """Test the daemon request/response loop shared by the CLI tools."""
+
+    # Daemon process: echoes, exits or fails depending on the command
+    DAEMON_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+import socket_daemon
+
+def handle(request):
+    if request['cmd'] == 'echo':
+        print(request['text'])
+        return request['text'].upper()
+    if request['cmd'] == 'exit':
+        sys.exit(3)
+    raise ValueError('unknown command')
+
+socket_daemon.serve(sys.argv[2], handle)
+"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.test_dir, 'test.sock')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _start_daemon(self):
+        import socket_daemon
+
+        process = subprocess.Popen(
+            [sys.executable, '-c', self.DAEMON_SCRIPT,
+             os.path.dirname(socket_daemon.__file__), self.socket_path],
+            stdout=subprocess.DEVNULL
+        )
+        self.addCleanup(process.wait, 5)
+        self.addCleanup(process.terminate)
+        deadline = time.monotonic() + 10
+        while socket_daemon.send(self.socket_path, {'cmd': 'ping'}) is None:
+            if process.poll() is not None or time.monotonic() > deadline:
+                self.fail("daemon did not start")
+            time.sleep(0.05)
+        return process
+
+    def test_daemon_replies_and_survives_failing_commands(self):
+        """CONTRACT: Failing commands (even sys.exit) get an error reply."""
+        from socket_daemon import send
+
+        process = self._start_daemon()
+
+        reply = send(self.socket_path, {'cmd': 'echo', 'text': 'hi'})
+        self.assertEqual(reply, {'ok': True, 'result': 'HI', 'output': 'hi\n'})
+
+        reply = send(self.socket_path, {'cmd': 'exit'})
+        self.assertFalse(reply['ok'])
+        self.assertTrue(reply['error'].startswith('SystemExit'))
+
+        reply = send(self.socket_path, {'cmd': 'unknown'})
+        self.assertEqual(reply['error'], 'ValueError: unknown command')
+
+        # Still serving after the failures
+        self.assertTrue(send(self.socket_path, {'cmd': 'echo', 'text': 'x'})['ok'])
+
+        # SIGTERM stops the daemon and removes its socket
+        process.terminate()
+        process.wait(5)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_send_returns_none_without_daemon(self):
+        """CONTRACT: send() returns None (CLI runs locally) if no daemon answers."""
+        from socket_daemon import send
+
+        self.assertIsNone(send(self.socket_path, {'cmd': 'ping'}))
+
+        # Stale socket file left behind by a dead daemon
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        self.assertIsNone(send(self.socket_path, {'cmd': 'ping'}))
+
+
+class MigrationContract(unittest.TestCase):
+    """Test schema migration contracts."""
+
+    SCHEMA = Path(__file__).parent.parent / 'schemas' / 'schema_v2.2_jsonb.sql'
+    MIGRATIONS = Path(__file__).parent.parent / 'schemas' / 'migrations'
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'test.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _run_script(self, script_path):
+        """Apply a .sql file the way its Usage line does (sqlite3 shell if installed)."""
+        shell = shutil.which('sqlite3')
+        if shell:
+            with open(script_path) as f:
+                subprocess.run([shell, self.db_path], stdin=f, check=True,
+                               stdout=subprocess.DEVNULL)
+            return
+        # No shell: run the SQL without its dot-commands
+        with open(script_path) as f:
+            sql = ''.join(line for line in f if not line.startswith('.'))
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(sql)
+        conn.close()
+
+    @unittest.skipIf(sqlite3.sqlite_version_info < (3, 47, 0),
+                     "contentless_unindexed FTS5 needs SQLite 3.47+")
+    def test_chunks_fts_doc_type_migration_reruns(self):
+        """CONTRACT: Re-running a migration must leave a working database."""
+        self._run_script(self.SCHEMA)
+        migration = self.MIGRATIONS / 'add_chunks_fts_doc_type.sql'
+        self._run_script(migration)
+        self._run_script(migration)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            doc_id = conn.execute(
+                "INSERT INTO docs (module, slug, title, doc_type, source) "
+                "VALUES ('TEST', 'test', 'Test', 'note', 'test') RETURNING id"
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chunks (doc_id, ord, text) VALUES (?, 0, 'test checkpoint')",
+                (doc_id,)
+            )
+            conn.commit()
+
+            rows = conn.execute(
+                "SELECT doc_type FROM chunks_fts WHERE chunks_fts MATCH 'checkpoint'"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        self.assertEqual(rows, [('note',)], "Chunk should be indexed with its doc_type")
+
+
 class PerformanceContract(unittest.TestCase):
     """Test performance contracts (optional, for large datasets)."""
 
@@ -349,6 +749,7 @@ def main():
 
         suite.addTests(loader.loadTestsFromTestCase(SchemaContract))
         suite.addTests(loader.loadTestsFromTestCase(DataIntegrityContract))
+        suite.addTests(loader.loadTestsFromTestCase(MigrationContract))
 
         runner = unittest.TextTestRunner(verbosity=2)
         result = runner.run(suite)